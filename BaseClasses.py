@@ -1,6 +1,8 @@
 import copy
 import json
 import logging
+import sys
+import time
 from collections import OrderedDict, Counter, deque, defaultdict
 from enum import Enum, unique
 
@@ -11,7 +13,7 @@ except ImportError:
 
 
 from source.classes.BabelFish import BabelFish
-from EntranceShuffle import door_addresses, indirect_connections
+from EntranceShuffle import door_addresses, indirect_connections, EntranceStats
 from Utils import int16_as_bytes
 from Tables import normal_offset_table, spiral_offset_table, multiply_lookup, divisor_lookup
 from RoomData import Room
@@ -43,8 +45,6 @@ class World(object):
         self.state = CollectionState(self)
         self._cached_entrances = None
         self._cached_locations = None
-        self._entrance_cache = {}
-        self._location_cache = {}
         self.required_locations = []
         self.shuffle_bonk_prizes = False
         self.light_world_light_cone = False
@@ -70,7 +70,7 @@ class World(object):
         self.spoiler = Spoiler(self)
         self.lamps_needed_for_dark_rooms = 1
         self.doors = []
-        self._door_cache = {}
+        self.door_adjacency = {}
         self.paired_doors = {}
         self.rooms = []
         self._room_cache = {}
@@ -83,6 +83,7 @@ class World(object):
         self._portal_cache = {}
         self.sanc_portal = {}
         self.fish = BabelFish()
+        self.lookup_stats = None
 
         for player in range(1, players + 1):
             # If World State is Retro, set to Open and set Retro flag
@@ -91,7 +92,15 @@ class World(object):
                 self.retro[player] = True
             def set_player_attr(attr, val):
                 self.__dict__.setdefault(attr, {})[player] = val
+            # name -> object per player, doors also get a dense id indexing _doors_by_id and _door_entrances
             set_player_attr('_region_cache', {})
+            set_player_attr('_entrance_cache', {})
+            set_player_attr('_location_cache', {})
+            set_player_attr('_door_cache', {})
+            set_player_attr('_door_misses', set())
+            set_player_attr('_doors_by_id', [])
+            set_player_attr('_door_entrances', [])
+            set_player_attr('entrance_stats', EntranceStats())
             set_player_attr('player_names', [])
             set_player_attr('remote_items', False)
             set_player_attr('required_medallions', ['Ether', 'Quake'])
@@ -146,17 +155,42 @@ class World(object):
             region.world = self
             self._region_cache[region.player][region.name] = region
             for exit in region.exits:
-                self._entrance_cache[(exit.name, exit.player)] = exit
+                self._entrance_cache[exit.player][exit.name] = exit
+            for location in region.locations:
+                self._location_cache[location.player][location.name] = location
 
-    def initialize_doors(self, doors):
+    def initialize_doors(self, doors, replace=True):
         for door in doors:
-            self._door_cache[(door.name, door.player)] = door
+            if replace or door.name not in self._door_cache[door.player]:
+                self._door_cache[door.player][door.name] = door
+            self._door_misses[door.player].clear()
+            door.door_id = len(self._doors_by_id[door.player])
+            self._doors_by_id[door.player].append(door)
+            self._door_entrances[door.player].append(None)
 
     def remove_door(self, door, player):
-        if (door, player) in self._door_cache.keys():
-            del self._door_cache[(door, player)]
+        if door in self._door_cache[player].keys():
+            del self._door_cache[player][door]
         self.doors.remove(door)
 
+    def get_door_by_id(self, door_id, player):
+        return self._doors_by_id[player][door_id]
+
+    def get_door_entrance(self, door):
+        # resolved by door id instead of by name, the entrance is looked up once per door
+        if door.door_id is None:  # not added through initialize_doors
+            return self.get_entrance(door.name, door.player)
+        entrances = self._door_entrances[door.player]
+        entrance = entrances[door.door_id]
+        if entrance is None:
+            entrance = entrances[door.door_id] = self.get_entrance(door.name, door.player)
+        return entrance
+
+    def count_lookups(self):
+        self.lookup_stats = LookupStats()
+        self.lookup_stats.install(self)
+        return self.lookup_stats
+
     def get_regions(self, player=None):
         return self.regions if player is None else self._region_cache[player].values()
 
@@ -176,29 +210,29 @@ class World(object):
         if isinstance(entrance, Entrance):
             return entrance
         try:
-            return self._entrance_cache[(entrance, player)]
+            return self._entrance_cache[player][entrance]
         except KeyError:
             for region in self.regions:
                 for exit in region.exits:
                     if exit.name == entrance and exit.player == player:
-                        self._entrance_cache[(entrance, player)] = exit
+                        self._entrance_cache[player][entrance] = exit
                         return exit
             raise RuntimeError('No such entrance %s for player %d' % (entrance, player))
 
     def remove_entrance(self, entrance, player):
-        if (entrance, player) in self._entrance_cache.keys():
-            del self._entrance_cache[(entrance, player)]
+        if entrance in self._entrance_cache[player].keys():
+            del self._entrance_cache[player][entrance]
 
     def get_location(self, location, player):
         if isinstance(location, Location):
             return location
         try:
-            return self._location_cache[(location, player)]
+            return self._location_cache[player][location]
         except KeyError:
             for region in self.regions:
                 for r_location in region.locations:
                     if r_location.name == location and r_location.player == player:
-                        self._location_cache[(location, player)] = r_location
+                        self._location_cache[player][location] = r_location
                         return r_location
         raise RuntimeError('No such location %s for player %d' % (location, player))
 
@@ -215,14 +249,18 @@ class World(object):
         if isinstance(doorname, Door):
             return doorname
         try:
-            return self._door_cache[(doorname, player)]
+            return self._door_cache[player][doorname]
         except KeyError:
             for door in self.doors:
                 if door.name == doorname and door.player == player:
-                    self._door_cache[(doorname, player)] = door
+                    self._door_cache[player][doorname] = door
                     return door
             raise RuntimeError('No such door %s for player %d' % (doorname, player))
 
+    def invalidate_door_adjacency(self, player, regions):
+        if player in self.door_adjacency:
+            self.door_adjacency[player].invalidate([x for x in regions if x is not None])
+
     def get_portal(self, portal_name, player):
         if isinstance(portal_name, Portal):
             return portal_name
@@ -239,24 +277,27 @@ class World(object):
         if isinstance(doorname, Door):
             return doorname
         try:
-            return self._door_cache[(doorname, player)]
+            return self._door_cache[player][doorname]
         except KeyError:
+            if doorname in self._door_misses[player]:
+                return None
             for door in self.doors:
                 if door.name == doorname and door.player == player:
-                    self._door_cache[(doorname, player)] = door
+                    self._door_cache[player][doorname] = door
                     return door
+            self._door_misses[player].add(doorname)
             return None
 
     def check_for_entrance(self, entrance, player):
         if isinstance(entrance, Entrance):
             return entrance
         try:
-            return self._entrance_cache[(entrance, player)]
+            return self._entrance_cache[player][entrance]
         except KeyError:
             for region in self.regions:
                 for ext in region.exits:
                     if ext.name == entrance and ext.player == player:
-                        self._entrance_cache[(entrance, player)] = ext
+                        self._entrance_cache[player][entrance] = ext
                         return ext
             return None
 
@@ -266,10 +307,11 @@ class World(object):
         try:
             return self._room_cache[(room_idx, player)]
         except KeyError:
+            # cache every room on the way, a miss per room is quadratic in multiworld
             for room in self.rooms:
-                if room.index == room_idx and room.player == player:
-                    self._room_cache[(room_idx, player)] = room
-                    return room
+                self._room_cache.setdefault((room.index, room.player), room)
+            if (room_idx, player) in self._room_cache:
+                return self._room_cache[(room_idx, player)]
             raise RuntimeError('No such room %s for player %d' % (room_idx, player))
 
     def get_all_state(self, keys=False):
@@ -552,15 +594,32 @@ class CollectionState(object):
 
 
     def sweep_for_events(self, key_only=False, locations=None):
-        # this may need improvement
         if locations is None:
             locations = self.world.get_filled_locations()
+        event_locations = [location for location in locations if location.event and
+                           (not key_only or (not self.world.keyshuffle[location.item.player] and location.item.smallkey) or (not self.world.bigkeyshuffle[location.item.player] and location.item.bigkey))]
+        # index pending events by region - a location never becomes unreachable while sweeping,
+        # so only the ones not yet reached are checked again, and only once their region is reachable
+        pending = defaultdict(list)
+        for location in event_locations:
+            pending[location.parent_region].append(location)
+        reached = set()
         new_locations = True
         checked_locations = 0
         while new_locations:
-            reachable_events = [location for location in locations if location.event and
-                                (not key_only or (not self.world.keyshuffle[location.item.player] and location.item.smallkey) or (not self.world.bigkeyshuffle[location.item.player] and location.item.bigkey))
-                                and location.can_reach(self)]
+            for region, region_events in list(pending.items()):
+                if region.can_reach(self):
+                    remaining = []
+                    for location in region_events:
+                        if location.access_rule(self):
+                            reached.add(location)
+                        else:
+                            remaining.append(location)
+                    if remaining:
+                        pending[region] = remaining
+                    else:
+                        del pending[region]
+            reachable_events = [location for location in event_locations if location in reached]
             reachable_events = self._do_not_flood_the_keys(reachable_events)
             for event in reachable_events:
                 if (event.name, event.player) not in self.events:
@@ -889,6 +948,9 @@ class RegionType(Enum):
 
 class Region(object):
 
+    __slots__ = ('name', 'type', 'entrances', 'exits', 'locations', 'dungeon', 'shop', 'world', 'is_light_world',
+                 'is_dark_world', 'spot_type', 'hint_text', 'recursion_count', 'player', 'crystal_switch')
+
     def __init__(self, name, type, hint, player):
         self.name = name
         self.type = type
@@ -939,6 +1001,9 @@ class Region(object):
 
 class Entrance(object):
 
+    __slots__ = ('name', 'parent_region', 'connected_region', 'target', 'addresses', 'spot_type', 'recursion_count',
+                 'vanilla', 'access_rule', 'player', 'door', 'hide_path')
+
     def __init__(self, player, name='', parent=None):
         self.name = name
         self.parent_region = parent
@@ -978,6 +1043,9 @@ class Entrance(object):
 
 class Dungeon(object):
 
+    __slots__ = ('name', 'regions', 'big_key', 'small_keys', 'dungeon_items', 'bosses', 'player', 'world',
+                 'dungeon_id', 'entrance_regions')
+
     def __init__(self, name, regions, big_key, small_keys, dungeon_items, player, dungeon_id):
         self.name = name
         self.regions = regions
@@ -1180,6 +1248,12 @@ class CrystalBarrier(FastEnum):
 
 
 class Door(object):
+    __slots__ = ('player', 'name', 'type', 'direction', 'roomIndex', 'doorIndex', 'layer', 'pseudo_bg', 'toggle',
+                 'trapFlag', 'quadrant', 'shiftX', 'shiftY', 'zeroHzCam', 'zeroVtCam', 'doorListPos', 'edge_id',
+                 'edge_width', 'portalAble', 'roomLayout', 'entranceFlag', 'deadEnd', 'passage', 'dungeonLink',
+                 'bk_shuffle_req', 'dest', 'blocked', 'stonewall', 'smallKey', 'bigKey', 'ugly', 'crystal',
+                 'req_event', 'controller', 'dependents', 'dead', 'door_id', 'entrance')
+
     def __init__(self, player, name, type, entrance=None):
         self.player = player
         self.name = name
@@ -1229,6 +1303,7 @@ class Door(object):
         self.dependents = []
         self.dead = False
 
+        self.door_id = None
         self.entrance = entrance
         if entrance is not None:
             entrance.door = self
@@ -1374,8 +1449,117 @@ class Door(object):
         return '%s' % self.name
 
 
+class LookupStats(object):
+    # counts the name lookups made on a world, by method and calling function
+    # the counting wrappers are installed on the world instance, so worlds without stats pay nothing
+    methods = ['get_region', 'get_entrance', 'get_location', 'get_door', 'check_for_door', 'check_for_entrance']
+
+    def __init__(self):
+        self.counts = Counter()
+        self.times = defaultdict(float)
+
+    def install(self, world):
+        world.lookup_stats = self
+        for name in self.methods:
+            setattr(world, name, self.counter(name, getattr(world, name)))
+
+    def counter(self, name, method):
+        def counted_lookup(*args):
+            start = time.perf_counter()
+            try:
+                return method(*args)
+            finally:
+                self.times[name] += time.perf_counter() - start
+                self.counts[(name, sys._getframe(1).f_code.co_name)] += 1
+        return counted_lookup
+
+    def report(self, logger, limit=10):
+        totals = Counter()
+        for (name, caller), count in self.counts.items():
+            totals[name] += count
+        for name, count in totals.most_common():
+            logger.info('%s: %d lookups, %.3fs', name, count, self.times[name])
+        for (name, caller), count in self.counts.most_common(limit):
+            logger.info('  %d %s from %s', count, name, caller)
+
+
+class DoorAdjacency(object):
+    # static region -> door index for one player, built once the doors are created and linked
+    # exit doors never change after that, entrance doors are rebuilt lazily after a connect invalidates them
+
+    def __init__(self, world, player):
+        self.world = world
+        self.player = player
+        self.region_ids = {}
+        self.exit_doors = []
+        self.entrance_doors = []
+        self.non_door_entrances = []
+        for region in world.get_regions(player):
+            self.region_ids[region] = len(self.exit_doors)
+            self.exit_doors.append((len(region.exits), self.find_doors(region.exits)))
+            self.entrance_doors.append(None)
+            self.non_door_entrances.append(None)
+
+    def find_doors(self, entrances):
+        doors = []
+        for ext in entrances:
+            door = self.world.check_for_door(ext.name, self.player)
+            if door is not None:
+                doors.append(door)
+        return doors
+
+    # the returned lists are shared - callers must not modify them
+    def get_doors(self, region):
+        r_id = self.region_ids.get(region)
+        if r_id is None:
+            return self.find_doors(region.exits)
+        exit_cnt, doors = self.exit_doors[r_id]
+        if exit_cnt != len(region.exits):  # exits added after linking (e.g. standard rules)
+            doors = self.find_doors(region.exits)
+            self.exit_doors[r_id] = len(region.exits), doors
+        return doors
+
+    def get_entrance_doors(self, region):
+        r_id = self.region_ids.get(region)
+        if r_id is None:
+            return self.find_doors(region.entrances)
+        if self.entrance_doors[r_id] is None:
+            self._index_entrances(r_id, region)
+        return self.entrance_doors[r_id]
+
+    def get_non_door_entrances(self, region):
+        r_id = self.region_ids.get(region)
+        if r_id is None:
+            return [x for x in region.entrances if self.world.check_for_door(x.name, self.player) is None]
+        if self.non_door_entrances[r_id] is None:
+            self._index_entrances(r_id, region)
+        return self.non_door_entrances[r_id]
+
+    def _index_entrances(self, r_id, region):
+        doors, others = [], []
+        for ent in region.entrances:
+            door = self.world.check_for_door(ent.name, self.player)
+            if door is not None:
+                doors.append(door)
+            else:
+                others.append(ent)
+        self.entrance_doors[r_id] = doors
+        self.non_door_entrances[r_id] = others
+
+    def invalidate(self, regions):
+        for region in regions:
+            r_id = self.region_ids.get(region)
+            if r_id is not None:
+                self.entrance_doors[r_id] = None
+                self.non_door_entrances[r_id] = None
+
+
 class Sector(object):
 
+    __slots__ = ('regions', 'outstanding_doors', 'name', 'r_name_set', 'chest_locations', 'key_only_locations',
+                 'c_switch', 'orange_barrier', 'blue_barrier', 'bk_required', 'bk_provided', 'conn_balance',
+                 'branch_factor', 'dead_end_cnt', 'entrance_sector', 'destination_entrance', 'equations')
+
     def __init__(self):
         self.regions = []
         self.outstanding_doors = []
@@ -1615,6 +1799,10 @@ class Boss(object):
         return self.defeat_rule(state, self.player)
 
 class Location(object):
+    __slots__ = ('name', 'parent_region', 'forced_item', 'item', 'event', 'crystal', 'address', 'player_address',
+                 'spot_type', 'hint_text', 'recursion_count', 'staleness_count', 'locked', 'always_allow',
+                 'access_rule', 'item_rule', 'player')
+
     def __init__(self, player, name='', address=None, crystal=False, hint_text=None, parent=None, forced_item=None, player_address=None):
         self.name = name
         self.parent_region = parent
@@ -1677,6 +1865,10 @@ class Location(object):
 
 class Item(object):
 
+    __slots__ = ('name', 'advancement', 'priority', 'type', 'pedestal_hint_text', 'pedestal_credit_text',
+                 'sickkid_credit_text', 'zora_credit_text', 'magicshop_credit_text', 'fluteboy_credit_text',
+                 'hint_text', 'code', 'location', 'world', 'player')
+
     def __init__(self, name='', advancement=False, priority=False, type=None, code=None, pedestal_hint=None, pedestal_credit=None, sickkid_credit=None, zora_credit=None, witch_credit=None, fluteboy_credit=None, hint_text=None, player=None):
         self.name = name
         self.advancement = advancement
@@ -1723,7 +1915,7 @@ class Item(object):
 
 # have 6 address that need to be filled
 class Crystal(Item):
-    pass
+    __slots__ = ()
 
 @unique
 class ShopType(Enum):
@@ -1843,29 +2035,30 @@ class Spoiler(object):
         self.startinventory = list(map(str, self.world.precollected_items))
 
         self.locations = OrderedDict()
-        listed_locations = set()
-
-        lw_locations = [loc for loc in self.world.get_locations() if loc not in listed_locations and loc.parent_region and loc.parent_region.type == RegionType.LightWorld]
-        self.locations['Light World'] = OrderedDict([(location.gen_name(), str(location.item) if location.item is not None else 'Nothing') for location in lw_locations])
-        listed_locations.update(lw_locations)
-
-        dw_locations = [loc for loc in self.world.get_locations() if loc not in listed_locations and loc.parent_region and loc.parent_region.type == RegionType.DarkWorld]
-        self.locations['Dark World'] = OrderedDict([(location.gen_name(), str(location.item) if location.item is not None else 'Nothing') for location in dw_locations])
-        listed_locations.update(dw_locations)
+        # bucket every location in one pass, region type wins over dungeon
+        region_buckets = {RegionType.LightWorld: [], RegionType.DarkWorld: [], RegionType.Cave: []}
+        dungeon_buckets = {id(dungeon): [] for dungeon in self.world.dungeons}
+        other_locations = []
+        for loc in self.world.get_locations():
+            if loc.parent_region is None:
+                other_locations.append(loc)
+            elif loc.parent_region.type in region_buckets:
+                region_buckets[loc.parent_region.type].append(loc)
+            elif id(loc.parent_region.dungeon) in dungeon_buckets:
+                dungeon_buckets[id(loc.parent_region.dungeon)].append(loc)
+            else:
+                other_locations.append(loc)
 
-        cave_locations = [loc for loc in self.world.get_locations() if loc not in listed_locations and loc.parent_region and loc.parent_region.type == RegionType.Cave]
-        self.locations['Caves'] = OrderedDict([(location.gen_name(), str(location.item) if location.item is not None else 'Nothing') for location in cave_locations])
-        listed_locations.update(cave_locations)
+        def location_listing(locations):
+            return OrderedDict([(location.gen_name(), str(location.item) if location.item is not None else 'Nothing') for location in locations])
 
+        self.locations['Light World'] = location_listing(region_buckets[RegionType.LightWorld])
+        self.locations['Dark World'] = location_listing(region_buckets[RegionType.DarkWorld])
+        self.locations['Caves'] = location_listing(region_buckets[RegionType.Cave])
         for dungeon in self.world.dungeons:
-            dungeon_locations = [loc for loc in self.world.get_locations() if loc not in listed_locations and loc.parent_region and loc.parent_region.dungeon == dungeon]
-            self.locations[str(dungeon)] = OrderedDict([(location.gen_name(), str(location.item) if location.item is not None else 'Nothing') for location in dungeon_locations])
-            listed_locations.update(dungeon_locations)
-
-        other_locations = [loc for loc in self.world.get_locations() if loc not in listed_locations]
+            self.locations[str(dungeon)] = location_listing(dungeon_buckets[id(dungeon)])
         if other_locations:
-            self.locations['Other Locations'] = OrderedDict([(location.gen_name(), str(location.item) if location.item is not None else 'Nothing') for location in other_locations])
-            listed_locations.update(other_locations)
+            self.locations['Other Locations'] = location_listing(other_locations)
 
         self.shops = []
         for shop in self.world.shops:
@@ -1939,7 +2132,7 @@ class Spoiler(object):
                          'keydropshuffle': self.world.keydropshuffle,
                          }
 
-    def to_json(self):
+    def json_data(self):
         self.parse_data()
         out = OrderedDict()
         out['Entrances'] = list(self.entrances.values())
@@ -1957,8 +2150,14 @@ class Spoiler(object):
         out['paths'] = self.paths
         out['Bosses'] = self.bosses
         out['meta'] = self.metadata
+        return out
+
+    def iter_json(self):
+        # json chunks as they are encoded, so the whole string never has to be built
+        return json.JSONEncoder().iterencode(self.json_data())
 
-        return json.dumps(out)
+    def to_json(self):
+        return json.dumps(self.json_data())
 
     def to_file(self, filename):
         self.parse_data()
@@ -2002,13 +2201,13 @@ class Spoiler(object):
                 outfile.write('Key Drops shuffled:              %s\n' % ('Yes' if self.metadata['keydropshuffle'][player] else 'No'))
             if self.doors:
                 outfile.write('\n\nDoors:\n\n')
-                outfile.write('\n'.join(
-                    ['%s%s %s %s %s' % ('Player {0}: '.format(entry['player']) if self.world.players > 1 else '',
+                write_lines(outfile,
+                    ('%s%s %s %s %s' % ('Player {0}: '.format(entry['player']) if self.world.players > 1 else '',
                                         self.world.fish.translate("meta","doors",entry['entrance']),
                                         '<=>' if entry['direction'] == 'both' else '<=' if entry['direction'] == 'exit' else '=>',
                                         self.world.fish.translate("meta","doors",entry['exit']),
                                         '({0})'.format(entry['dname']) if self.world.doorShuffle[entry['player']] == 'crossed' else '') for
-                     entry in self.doors.values()]))
+                     entry in self.doors.values()))
             if self.lobbies:
                 outfile.write('\n\nDungeon Lobbies:\n\n')
                 outfile.write('\n'.join(
@@ -2023,7 +2222,7 @@ class Spoiler(object):
             if self.entrances:
                 # entrances: To/From overworld; Checking w/ & w/out "Exit" and translating accordingly
                 outfile.write('\n\nEntrances:\n\n')
-                outfile.write('\n'.join(['%s%s %s %s' % (f'{self.world.get_player_names(entry["player"])}: ' if self.world.players > 1 else '', self.world.fish.translate("meta","entrances",entry['entrance']), '<=>' if entry['direction'] == 'both' else '<=' if entry['direction'] == 'exit' else '=>', self.world.fish.translate("meta","entrances",entry['exit'])) for entry in self.entrances.values()]))
+                write_lines(outfile, ('%s%s %s %s' % (f'{self.world.get_player_names(entry["player"])}: ' if self.world.players > 1 else '', self.world.fish.translate("meta","entrances",entry['entrance']), '<=>' if entry['direction'] == 'both' else '<=' if entry['direction'] == 'exit' else '=>', self.world.fish.translate("meta","entrances",entry['exit'])) for entry in self.entrances.values()))
             outfile.write('\n\nMedallions:\n')
             for dungeon, medallion in self.medallions.items():
                 outfile.write(f'\n{dungeon}: {medallion} Medallion')
@@ -2034,7 +2233,7 @@ class Spoiler(object):
             # locations: Change up location names; in the instance of a location with multiple sections, it'll try to translate the room name
             # items: Item names
             outfile.write('\n\nLocations:\n\n')
-            outfile.write('\n'.join(['%s: %s' % (self.world.fish.translate("meta", "locations", location), self.world.fish.translate("meta", "items", item)) for grouping in self.locations.values() for (location, item) in grouping.items()]))
+            write_lines(outfile, ('%s: %s' % (self.world.fish.translate("meta", "locations", location), self.world.fish.translate("meta", "items", item)) for grouping in self.locations.values() for (location, item) in grouping.items()))
 
             # locations: Change up location names; in the instance of a location with multiple sections, it'll try to translate the room name
             # items: Item names
@@ -2050,7 +2249,7 @@ class Spoiler(object):
             # locations: Change up location names; in the instance of a location with multiple sections, it'll try to translate the room name
             # items: Item names
             outfile.write('\n\nPlaythrough:\n\n')
-            outfile.write('\n'.join(['%s: {\n%s\n}' % (sphere_nr, '\n'.join(['  %s: %s' % (self.world.fish.translate("meta","locations",location), self.world.fish.translate("meta","items",item)) for (location, item) in sphere.items()] if sphere_nr != '0' else [f'  {item}' for item in sphere])) for (sphere_nr, sphere) in self.playthrough.items()]))
+            write_lines(outfile, ('%s: {\n%s\n}' % (sphere_nr, '\n'.join(['  %s: %s' % (self.world.fish.translate("meta","locations",location), self.world.fish.translate("meta","items",item)) for (location, item) in sphere.items()] if sphere_nr != '0' else [f'  {item}' for item in sphere])) for (sphere_nr, sphere) in self.playthrough.items()))
             if self.unreachables:
                 # locations: Change up location names; in the instance of a location with multiple sections, it'll try to translate the room name
                 # items: Item names
@@ -2063,17 +2262,26 @@ class Spoiler(object):
             # entrances: To/From overworld; Checking w/ & w/out "Exit" and translating accordingly
             # locations: Change up location names; in the instance of a location with multiple sections, it'll try to translate the room name
             outfile.write('\n\nPaths:\n\n')
-            path_listings = []
-            for location, path in sorted(self.paths.items()):
-                path_lines = []
-                for region, exit in path:
-                    if exit is not None:
-                        path_lines.append("{} -> {}".format(self.world.fish.translate("meta","rooms",region), self.world.fish.translate("meta","entrances",exit)))
-                    else:
-                        path_lines.append(self.world.fish.translate("meta","rooms",region))
-                path_listings.append("{}\n        {}".format(self.world.fish.translate("meta","locations",location), "\n   =>   ".join(path_lines)))
-
-            outfile.write('\n'.join(path_listings))
+            def path_listings():
+                for location, path in sorted(self.paths.items()):
+                    path_lines = []
+                    for region, exit in path:
+                        if exit is not None:
+                            path_lines.append("{} -> {}".format(self.world.fish.translate("meta","rooms",region), self.world.fish.translate("meta","entrances",exit)))
+                        else:
+                            path_lines.append(self.world.fish.translate("meta","rooms",region))
+                    yield "{}\n        {}".format(self.world.fish.translate("meta","locations",location), "\n   =>   ".join(path_lines))
+
+            write_lines(outfile, path_listings())
+
+
+def write_lines(outfile, lines):
+    # same output as outfile.write('\n'.join(lines)) without holding the joined section in memory
+    separator = ''
+    for line in lines:
+        outfile.write(separator)
+        outfile.write(line)
+        separator = '\n'
 
 
 flooded_keys = {
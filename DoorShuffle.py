@@ -8,6 +8,7 @@ from typing import DefaultDict, Dict, List
 
 from functools import reduce
 from BaseClasses import RegionType, Region, Door, DoorType, Direction, Sector, CrystalBarrier, DungeonInfo
+from BaseClasses import DoorAdjacency
 from Dungeons import dungeon_regions, region_starts, standard_starts, split_region_starts
 from Dungeons import dungeon_bigs, dungeon_keys, dungeon_hints
 from Items import ItemFactory
@@ -218,7 +219,9 @@ def connect_custom(world, player):
 
 def connect_simple_door(world, exit_name, region_name, player):
     region = world.get_region(region_name, player)
-    world.get_entrance(exit_name, player).connect(region)
+    entrance = world.get_entrance(exit_name, player)
+    world.invalidate_door_adjacency(player, [entrance.connected_region, region])
+    entrance.connect(region)
     d = world.check_for_door(exit_name, player)
     if d is not None:
         d.dest = region
@@ -244,6 +247,8 @@ def connect_interior_doors(a, b, world, player):
 def connect_two_way(world, entrancename, exitname, player):
     entrance = world.get_entrance(entrancename, player)
     ext = world.get_entrance(exitname, player)
+    world.invalidate_door_adjacency(player, [entrance.connected_region, ext.connected_region,
+                                             entrance.parent_region, ext.parent_region])
 
     # if these were already connected somewhere, remove the backreference
     if entrance.connected_region is not None:
@@ -266,6 +271,8 @@ def connect_two_way(world, entrancename, exitname, player):
 def connect_one_way(world, entrancename, exitname, player):
     entrance = world.get_entrance(entrancename, player)
     ext = world.get_entrance(exitname, player)
+    world.invalidate_door_adjacency(player, [entrance.connected_region, ext.connected_region,
+                                             entrance.parent_region, ext.parent_region])
 
     # if these were already connected somewhere, remove the backreference
     if entrance.connected_region is not None:
@@ -1219,7 +1226,7 @@ def convert_to_sectors(region_names, world, player):
             door = ext.door
             if ext.connected_region is not None or door is not None and door.controller is not None:
                 if door is not None and door.controller is not None:
-                    connect_region = world.get_entrance(door.controller.name, player).parent_region
+                    connect_region = world.get_door_entrance(door.controller).parent_region
                 else:
                     connect_region = ext.connected_region
                 if connect_region not in region_chunk and connect_region in region_list:
@@ -1303,9 +1310,8 @@ def shuffle_key_doors(builder, world, player):
     num_key_doors = 0
     skips = []
     for region in builder.master_sector.regions:
-        for ext in region.exits:
-            d = world.check_for_door(ext.name, player)
-            if d is not None and d.smallKey:
+        for d in world.door_adjacency[player].get_doors(region):
+            if d.smallKey:
                 if d not in skips:
                     if d.type == DoorType.Interior:
                         skips.append(d.dest)
@@ -1834,6 +1840,8 @@ def add_inaccessible_doors(world, player):
     # todo: ignore standard mode hyrule castle ledge?
     for inaccessible_region in world.inaccessible_regions[player]:
         create_doors_for_inaccessible_region(inaccessible_region, world, player)
+    # all doors exist now
+    world.door_adjacency[player] = DoorAdjacency(world, player)
 
 
 def create_doors_for_inaccessible_region(inaccessible_region, world, player):
@@ -1852,13 +1860,28 @@ def create_door(world, player, entName, region_name):
         if ext.connected_region is not None and ext.connected_region.name == region_name:
             d = Door(player, ext.name, DoorType.Logical, ext),
             world.doors += d
+            world.initialize_doors(d, replace=False)
             connect_door_only(world, ext.name, ext.connected_region, player)
     d = Door(player, entName, DoorType.Logical, entrance),
     world.doors += d
+    world.initialize_doors(d, replace=False)
     connect_door_only(world, entName, connect, player)
 
 
 def check_required_paths(paths, world, player):
+    failures = find_unreachable_paths(paths, world, player)
+    if len(failures) > 0:
+        logger = logging.getLogger('')
+        for dungeon_name, start_regions, bad_region in failures:
+            logger.debug('%s cannot reach %s from %s', dungeon_name, bad_region, ', '.join(start_regions))
+        raise Exception('; '.join('%s cannot reach %s' % (dungeon_name, bad_region)
+                                  for dungeon_name, start_regions, bad_region in failures))
+
+
+# checks every dungeon of the player and reports all (dungeon, start regions, unreachable region) found
+def find_unreachable_paths(paths, world, player):
+    failures = []
+    door_targets = {}  # door name -> connected region, shared by every exploration of this player
     for dungeon_name in paths.keys():
         if dungeon_name in world.dungeon_layouts[player].keys():
             builder = world.dungeon_layouts[player][dungeon_name]
@@ -1882,7 +1905,7 @@ def check_required_paths(paths, world, player):
                         for region in start_regions:
                             state.visit_region(region)
                             state.add_all_doors_check_unattached(region, world, player)
-                        explore_state(state, world, player)
+                        explore_state(state, world, player, door_targets)
                         if initial and cached_initial_state is None:
                             cached_initial_state = state
                     else:
@@ -1890,10 +1913,12 @@ def check_required_paths(paths, world, player):
                     valid, bad_region = check_if_regions_visited(state, check_paths)
                     if not valid:
                         if check_for_pinball_fix(state, bad_region, world, player):
-                            explore_state(state, world, player)
+                            door_targets.clear()  # the pinball door was just connected
+                            explore_state(state, world, player, door_targets)
                             valid, bad_region = check_if_regions_visited(state, check_paths)
                     if not valid:
-                        raise Exception('%s cannot reach %s' % (dungeon_name, bad_region.name))
+                        failures.append((dungeon_name, list(start_regs), bad_region.name))
+    return failures
 
 
 def determine_init_crystal(initial, state, start_regions):
@@ -1912,10 +1937,15 @@ def determine_init_crystal(initial, state, start_regions):
         raise Exception(f'Can\'t get to {start_region.name} from initial state')
 
 
-def explore_state(state, world, player):
+def explore_state(state, world, player, door_targets=None):
     while len(state.avail_doors) > 0:
         door = state.next_avail_door().door
-        connect_region = world.get_entrance(door.name, player).connected_region
+        if door_targets is None:
+            connect_region = world.get_door_entrance(door).connected_region
+        else:
+            if door.name not in door_targets:
+                door_targets[door.name] = world.get_door_entrance(door).connected_region
+            connect_region = door_targets[door.name]
         if state.can_traverse(door) and not state.visited(connect_region) and valid_region_to_explore(connect_region, world, player):
             state.visit_region(connect_region)
             state.add_all_doors_check_unattached(connect_region, world, player)
@@ -1924,7 +1954,7 @@ def explore_state(state, world, player):
 def explore_state_not_inaccessible(state, world, player):
     while len(state.avail_doors) > 0:
         door = state.next_avail_door().door
-        connect_region = world.get_entrance(door.name, player).connected_region
+        connect_region = world.get_door_entrance(door).connected_region
         if state.can_traverse(door) and not state.visited(connect_region) and connect_region.type == RegionType.Dungeon:
             state.visit_region(connect_region)
             state.add_all_doors_check_unattached(connect_region, world, player)
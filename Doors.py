@@ -1269,7 +1269,7 @@ def create_doors(world, player):
     controller_door(east_controller, world.get_door('Ice Cross Bottom Push Block Right', player))
     controller_door(east_controller, world.get_door('Ice Cross Top Push Block Right', player))
 
-    assign_entrances(world, player)
+    assign_entrances(world, doors)
 
     dungeon_portals = [
         create_portal(player, 'Sanctuary', world.get_door('Sanctuary S', player), 0x02, 0x02),
@@ -1379,13 +1379,12 @@ def create_paired_doors(world, player):
     ]
 
 
-def assign_entrances(world, player):
-    for door in world.doors:
-        if door.player == player:
-            entrance = world.check_for_entrance(door.name, player)
-            if entrance is not None:
-                door.entrance = entrance
-                entrance.door = door
+def assign_entrances(world, doors):
+    for door in doors:
+        entrance = world.check_for_entrance(door.name, door.player)
+        if entrance is not None:
+            door.entrance = entrance
+            entrance.door = door
 
 
 def controller_door(controller, dependent):
@@ -48,10 +48,11 @@ def pre_validate(builder, entrance_region_names, split_dungeon, world, player):
         bk_needed = bk_needed or determine_if_bk_needed(sector, split_dungeon, world, player)
         bk_special = bk_special or check_for_special(sector)
     paths = determine_paths_for_dungeon(world, player, all_regions, builder.name)
+    checker = ProposalChecker(builder.name, doors_to_connect, all_regions, bk_needed, bk_special, paths,
+                              entrance_regions, world, player)
     dungeon, hangers, hooks = gen_dungeon_info(builder.name, builder.sectors, entrance_regions, all_regions,
                                                proposed_map, doors_to_connect, bk_needed, bk_special, world, player)
-    return check_valid(builder.name, dungeon, hangers, hooks, proposed_map, doors_to_connect, all_regions,
-                       bk_needed, bk_special, paths, entrance_regions, world, player)
+    return checker.check(dungeon, hangers, hooks, proposed_map)
 
 
 def generate_dungeon(builder, entrance_region_names, split_dungeon, world, player):
@@ -122,6 +123,8 @@ def generate_dungeon_find_proposal(builder, entrance_region_names, split_dungeon
     finished = False
     # flag if standard and this is hyrule castle
     paths = determine_paths_for_dungeon(world, player, all_regions, name)
+    checker = ProposalChecker(name, doors_to_connect, all_regions, bk_needed, bk_special, paths, entrance_regions,
+                              world, player)
     while not finished:
         # what are my choices?
         itr += 1
@@ -129,6 +132,7 @@ def generate_dungeon_find_proposal(builder, entrance_region_names, split_dungeon
             if attempt > 9:
                 raise GenerationException('Generation taking too long. Ref %s' % name)
             proposed_map = {}
+            checker.reset()
             choices_master = [[]]
             depth = 0
             dungeon_cache = {}
@@ -140,8 +144,7 @@ def generate_dungeon_find_proposal(builder, entrance_region_names, split_dungeon
             dungeon, hangers, hooks = gen_dungeon_info(name, builder.sectors, entrance_regions, all_regions, proposed_map,
                                                        doors_to_connect, bk_needed, bk_special, world, player)
             dungeon_cache[depth] = dungeon, hangers, hooks
-            valid = check_valid(name, dungeon, hangers, hooks, proposed_map, doors_to_connect, all_regions,
-                                bk_needed, bk_special, paths, entrance_regions, world, player)
+            valid = checker.check(dungeon, hangers, hooks, proposed_map)
         else:
             dungeon, hangers, hooks = dungeon_cache[depth]
             valid = True
@@ -165,6 +168,7 @@ def generate_dungeon_find_proposal(builder, entrance_region_names, split_dungeon
                 logger.debug(' ' * depth + "%d: Linking %s to %s", depth, hanger.name, hook.name)
                 proposed_map[hanger] = hook
                 proposed_map[hook] = hanger
+                checker.connect(hanger, hook)
                 last_choice = (hanger, hook)
                 choices_master[depth].append(last_choice)
                 depth += 1
@@ -182,15 +186,15 @@ def generate_dungeon_find_proposal(builder, entrance_region_names, split_dungeon
             logger.debug(' ' * depth + "%d: Rescinding %s, %s", depth, a.name, b.name)
             proposed_map.pop(a, None)
             proposed_map.pop(b, None)
+            checker.disconnect(a, b)
     return proposed_map
 
 
 def determine_if_bk_needed(sector, split_dungeon, world, player):
     if not split_dungeon:
         for region in sector.regions:
-            for ext in region.exits:
-                door = world.check_for_door(ext.name, player)
-                if door is not None and door.bigKey:
+            for door in get_doors(world, region, player):
+                if door.bigKey:
                     return True
     return False
 
@@ -406,7 +410,7 @@ def filter_choices(next_hanger, door, orig_hang, prev_choices, hook_candidates):
 
 
 def check_valid(name, dungeon, hangers, hooks, proposed_map, doors_to_connect, all_regions,
-                bk_needed, bk_special, paths, entrance_regions, world, player):
+                bk_needed, bk_special, paths, entrance_regions, world, player, region_map=None):
     # evaluate if everything is still plausible
 
     # only origin is left in the dungeon and not everything is connected
@@ -456,7 +460,7 @@ def check_valid(name, dungeon, hangers, hooks, proposed_map, doors_to_connect, a
     if not bk_possible:
         return False
     if not valid_paths(name, paths, entrance_regions, doors_to_connect, all_regions, proposed_map,
-                       bk_needed, bk_special, world, player):
+                       bk_needed, bk_special, world, player, region_map):
         return False
     new_hangers_found = True
     accessible_hook_types = []
@@ -485,38 +489,159 @@ def check_valid(name, dungeon, hangers, hooks, proposed_map, doors_to_connect, a
     return len(all_hangers.difference(hanger_matching)) == 0
 
 
+class ProposalChecker(object):
+    # check_valid that keeps the proposal counts up to date as doors are connected and rescinded
+    # set debug to compare every answer with check_valid
+    debug = False
+
+    def __init__(self, name, doors_to_connect, all_regions, bk_needed, bk_special, paths, entrance_regions,
+                 world, player):
+        self.name = name
+        self.doors_to_connect = doors_to_connect
+        self.all_regions = all_regions
+        self.bk_needed = bk_needed
+        self.bk_special = bk_special
+        self.paths = paths
+        self.entrance_regions = entrance_regions
+        self.world = world
+        self.player = player
+        self.region_map = {x.name: x for x in all_regions}
+        self.connected = set()
+        self.outstanding = defaultdict(int)
+        self.reset()
+
+    def reset(self):
+        self.connected.clear()
+        self.outstanding.clear()
+        for door in self.doors_to_connect.values():
+            self.outstanding[hook_from_door(door)] += 1
+
+    def connect(self, a, b):
+        for door in (a, b):
+            if door not in self.connected and self.doors_to_connect.get(door.name) == door:
+                self.connected.add(door)
+                self.outstanding[hook_from_door(door)] -= 1
+
+    def disconnect(self, a, b):
+        for door in (a, b):
+            if door in self.connected:
+                self.connected.remove(door)
+                self.outstanding[hook_from_door(door)] += 1
+
+    def check(self, dungeon, hangers, hooks, proposed_map):
+        valid = self.plausible(dungeon, hangers, hooks, proposed_map)
+        if self.debug:
+            expected = check_valid(self.name, dungeon, hangers, hooks, proposed_map, self.doors_to_connect,
+                                   self.all_regions, self.bk_needed, self.bk_special, self.paths,
+                                   self.entrance_regions, self.world, self.player, self.region_map)
+            if valid != expected:
+                raise GenerationException(f'Proposal checker disagrees with check_valid ({valid}). Ref {self.name}')
+        return valid
+
+    def plausible(self, dungeon, hangers, hooks, proposed_map):
+        world, player = self.world, self.player
+        all_connected = len(self.connected) == len(self.doors_to_connect)
+        # only origin is left in the dungeon and not everything is connected
+        if len(dungeon) <= 1 and not all_connected:
+            return False
+        origin = dungeon['Origin']
+        # origin has no more hooks, but not all doors have been proposed
+        if not world.bigkeyshuffle[player]:
+            possible_bks = len(origin.possible_bk_locations)
+            if not any(not x.bigKey or possible_bks > 0 or not self.bk_needed for x in origin.hooks.keys()):
+                if not all_connected:
+                    return False
+                if self.bk_needed and possible_bks == 0:
+                    return False
+        all_hooks = set()
+        for key, hook_set in hooks.items():
+            for hook in hook_set:
+                all_hooks.add(hook[0])
+        for key, hanger_set in hangers.items():
+            hook_count = len(hooks.get(key, ()))
+            if hook_count > 0 and len(hanger_set) == 0:
+                return False
+            if sum(1 for hanger in hanger_set if hanger not in all_hooks) > hook_count:
+                return False
+        for key, count in self.outstanding.items():
+            if count > 0 and len(hangers.get(key, ())) == 0 and len(hooks.get(opposite_h_type(key), ())) == 0:
+                return False
+        all_visited = set()
+        bk_possible = not self.bk_needed or (world.bigkeyshuffle[player] and not self.bk_special)
+        for piece in dungeon.values():
+            all_visited.update(piece.visited_regions)
+            if not bk_possible and len(piece.possible_bk_locations) > 0:
+                bk_possible = True
+        if not bk_possible or not self.all_regions.issubset(all_visited):
+            return False
+        if not valid_paths(self.name, self.paths, self.entrance_regions, self.doors_to_connect, self.all_regions,
+                           proposed_map, self.bk_needed, self.bk_special, world, player, self.region_map):
+            return False
+        return hangers_reachable(dungeon, hangers)
+
+
+# every hanger must be reachable from the origin through hooks of its type, walked once instead of to a fixed point
+def hangers_reachable(dungeon, hangers):
+    hanger_types = {}
+    for key, hanger_set in hangers.items():
+        for hanger in hanger_set:
+            hanger_types[hanger] = key
+    matched = set()
+    reached_types = set()
+    reached_hooks = set()
+    queue = deque(dungeon['Origin'].hooks.keys())
+    while len(queue) > 0:
+        door = queue.popleft()
+        if door in reached_hooks:
+            continue
+        reached_hooks.add(door)
+        new_hangers = [door] if door in hanger_types else []
+        h_type = hook_from_door(door)
+        if h_type not in reached_types:
+            reached_types.add(h_type)
+            new_hangers.extend(hangers.get(h_type, ()))
+        for hanger in new_hangers:
+            if hanger not in matched:
+                matched.add(hanger)
+                queue.extend(dungeon[hanger.name].hooks.keys())
+    return len(matched) == len(hanger_types)
+
+
 def valid_paths(name, paths, entrance_regions, valid_doors, all_regions, proposed_map,
-                bk_needed, bk_special, world, player):
+                bk_needed, bk_special, world, player, region_map=None):
+    if region_map is None:
+        region_map = {x.name: x for x in all_regions}
+    # paths sharing a start are all answered from one exploration
+    explorations = {}
     for path in paths:
         if type(path) is tuple:
-            target = path[1]
-            start_regions = []
-            for region in all_regions:
-                if path[0] == region.name:
-                    start_regions.append(region)
-                    break
+            start, target = path
         else:
-            target = path
-            start_regions = entrance_regions
-        if not valid_path(name, start_regions, target, valid_doors, proposed_map, all_regions,
-                          bk_needed, bk_special, world, player):
+            start, target = None, path
+        if start not in explorations:
+            if start is None:
+                start_regions = entrance_regions
+            else:
+                start_regions = [region_map[start]] if start in region_map else []
+            explorations[start] = explore_path(name, start_regions, valid_doors, proposed_map, all_regions,
+                                               bk_needed, bk_special, world, player)
+        state = explorations[start]
+        if state is not None and not path_found(state, target, region_map):
             return False
     return True
 
 
 def valid_path(name, starting_regions, target, valid_doors, proposed_map, all_regions,
                bk_needed, bk_special, world, player):
-    target_regions = set()
-    if type(target) is not list:
-        for region in all_regions:
-            if target == region.name:
-                target_regions.add(region)
-                break
-    else:
-        for region in all_regions:
-            if region.name in target:
-                target_regions.add(region)
+    region_map = {x.name: x for x in all_regions}
+    state = explore_path(name, starting_regions, valid_doors, proposed_map, all_regions,
+                         bk_needed, bk_special, world, player)
+    return state is None or path_found(state, target, region_map)
+
 
+# returns None when an outstanding connection is still possible, as any target could be reached through it
+def explore_path(name, starting_regions, valid_doors, proposed_map, all_regions,
+                 bk_needed, bk_special, world, player):
     start = ExplorationState(dungeon=name)
     start.big_key_special = bk_special
     bk_flag = False if world.bigkeyshuffle[player] and not bk_special else bk_needed
@@ -528,9 +653,15 @@ def valid_path(name, starting_regions, target, valid_doors, proposed_map, all_re
 
     for exp_door in original_state.unattached_doors:
         if not exp_door.door.blocked:
-            return True  # outstanding connection possible
-    for target in target_regions:
-        if original_state.visited_at_all(target):
+            return None  # outstanding connection possible
+    return original_state
+
+
+def path_found(state, target, region_map):
+    if type(target) is not list:
+        target = [target]
+    for region_name in target:
+        if region_name in region_map and state.visited_at_all(region_map[region_name]):
             return True
     return False  # couldn't find an outstanding door or the target
 
@@ -726,6 +857,8 @@ def connect_doors(a, b):
 
 
 def connect_two_way(entrance, ext):
+    entrance.parent_region.world.invalidate_door_adjacency(entrance.player, [
+        entrance.connected_region, ext.connected_region, entrance.parent_region, ext.parent_region])
 
     # if these were already connected somewhere, remove the backreference
     if entrance.connected_region is not None:
@@ -746,6 +879,8 @@ def connect_two_way(entrance, ext):
 
 
 def connect_one_way(entrance, ext):
+    entrance.parent_region.world.invalidate_door_adjacency(entrance.player, [
+        entrance.connected_region, ext.connected_region, ext.parent_region])
 
     # if these were already connected somewhere, remove the backreference
     if entrance.connected_region is not None:
@@ -765,6 +900,8 @@ def connect_one_way(entrance, ext):
 
 
 def connect_simple_door(exit_door, region):
+    exit_door.entrance.parent_region.world.invalidate_door_adjacency(exit_door.player, [
+        exit_door.entrance.connected_region, region])
     exit_door.entrance.connect(region)
     exit_door.dest = region
 
@@ -904,10 +1041,13 @@ class ExplorationState(object):
                     self.append_door_to_list(door, self.event_doors)
                 elif not self.in_door_list(door, self.avail_doors):
                     self.append_door_to_list(door, self.avail_doors)
-        for entrance in region.entrances:
-            door = world.check_for_door(entrance.name, player)
-            if door is None:
-                self.non_door_entrances.append(entrance)
+        if player in world.door_adjacency:
+            self.non_door_entrances.extend(world.door_adjacency[player].get_non_door_entrances(region))
+        else:
+            for entrance in region.entrances:
+                door = world.check_for_door(entrance.name, player)
+                if door is None:
+                    self.non_door_entrances.append(entrance)
 
     def add_all_doors_check_unattached(self, region, world, player):
         for door in get_doors(world, region, player):
@@ -1071,9 +1211,9 @@ def extend_reachable_state_improved(search_regions, state, proposed_map, all_reg
                 if big_not_found:
                     continue  # we can't open this door
         if explorable_door.door in proposed_map:
-            connect_region = world.get_entrance(proposed_map[explorable_door.door].name, player).parent_region
+            connect_region = world.get_door_entrance(proposed_map[explorable_door.door]).parent_region
         else:
-            connect_region = world.get_entrance(explorable_door.door.name, player).connected_region
+            connect_region = world.get_door_entrance(explorable_door.door).connected_region
         if connect_region is not None:
             if valid_region_to_explore_in_regions(connect_region, all_regions, world, player) and not local_state.visited(
                  connect_region):
@@ -1108,6 +1248,8 @@ def valid_region_to_explore(region, name, world, player):
 
 
 def get_doors(world, region, player):
+    if player in world.door_adjacency:
+        return world.door_adjacency[player].get_doors(region)
     res = []
     for ext in region.exits:
         door = world.check_for_door(ext.name, player)
@@ -1117,6 +1259,8 @@ def get_doors(world, region, player):
 
 
 def get_dungeon_doors(region, world, player):
+    if player in world.door_adjacency:
+        return world.door_adjacency[player].get_doors(region) if region.type == RegionType.Dungeon else []
     res = []
     for ext in region.exits:
         door = world.check_for_door(ext.name, player)
@@ -1126,6 +1270,8 @@ def get_dungeon_doors(region, world, player):
 
 
 def get_entrance_doors(world, region, player):
+    if player in world.door_adjacency:
+        return world.door_adjacency[player].get_entrance_doors(region)
     res = []
     for ext in region.entrances:
         door = world.check_for_door(ext.name, player)
@@ -1232,8 +1378,11 @@ def create_dungeon_builders(all_sectors, connections_tuple, world, player,
         split_dungeon_entrances = split_region_starts
     define_sector_features(all_sectors)
     finished, dungeon_map = False, {}
+    stats = SectorAssignmentStats()
+    crystal_features.clear()
     while not finished:
         logger.info('Shuffling Dungeon Sectors')
+        start = time.process_time()
         candidate_sectors = dict.fromkeys(all_sectors)
         global_pole = GlobalPolarity(candidate_sectors)
 
@@ -1302,7 +1451,9 @@ def create_dungeon_builders(all_sectors, connections_tuple, world, player,
                 neutral_sectors[sector] = None
             else:
                 polarized_sectors[sector] = None
+        start = stats.record('setup', start)
         assign_location_sectors(dungeon_map, free_location_sectors, global_pole)
+        start = stats.record('locations', start)
         leftover = assign_crystal_switch_sectors(dungeon_map, crystal_switches, crystal_barriers, global_pole)
         ensure_crystal_switches_reachable(dungeon_map, leftover, polarized_sectors, crystal_barriers, global_pole)
         for sector in leftover:
@@ -1312,6 +1463,7 @@ def create_dungeon_builders(all_sectors, connections_tuple, world, player,
                 polarized_sectors[sector] = None
         # blue barriers
         assign_crystal_barrier_sectors(dungeon_map, crystal_barriers, global_pole)
+        stats.record('crystal', start)
         try:
             # polarity:
             if not global_pole.is_valid(dungeon_map):
@@ -1319,16 +1471,82 @@ def create_dungeon_builders(all_sectors, connections_tuple, world, player,
                 raise NeutralizingException('Either free location/crystal assignment is already globally invalid')
             logger.info(world.fish.translate("cli", "cli", "balance.doors"))
             builder_info = dungeon_entrances, split_dungeon_entrances, connections_tuple, world, player
-            assign_polarized_sectors(dungeon_map, polarized_sectors, global_pole, builder_info)
+            sector_pools = [polarized_sectors, neutral_sectors]
+            assign_with_checkpoint('polarized', stats, dungeon_map, global_pole, sector_pools,
+                                   lambda: assign_polarized_sectors(dungeon_map, polarized_sectors, global_pole,
+                                                                    builder_info))
             # the rest
-            assign_the_rest(dungeon_map, neutral_sectors, global_pole, builder_info)
+            assign_with_checkpoint('rest', stats, dungeon_map, global_pole, sector_pools,
+                                   lambda: assign_the_rest(dungeon_map, neutral_sectors, global_pole, builder_info))
             dungeon_map.update(complete_dungeons)
             finished = True
         except NeutralizingException:
-            pass
+            stats.restarts += 1
+    stats.report(logger, player)
+    crystal_features.clear()
     return dungeon_map
 
 
+class SectorAssignmentStats:
+
+    def __init__(self):
+        self.restarts = 0
+        self.rollbacks = 0
+        self.phase_costs = defaultdict(float)
+
+    def record(self, phase, start):
+        now = time.process_time()
+        self.phase_costs[phase] += now - start
+        return now
+
+    def report(self, logger, player):
+        costs = ', '.join(f'{phase}: {cost:.3f}s' for phase, cost in self.phase_costs.items())
+        logger.debug(f'Sector assignment for player {player}: {self.restarts} restarts, '
+                     f'{self.rollbacks} rollbacks ({costs})')
+
+
+class AssignmentCheckpoint:
+
+    def __init__(self, dungeon_map, global_pole, sector_pools):
+        self.builder_states = {name: copy_builder_state(builder.__dict__) for name, builder in dungeon_map.items()}
+        self.global_pole = global_pole.copy()
+        self.sector_pools = [dict(pool) for pool in sector_pools]
+
+    def restore(self, dungeon_map, global_pole, sector_pools):
+        for name, builder in dungeon_map.items():
+            builder.__dict__.update(copy_builder_state(self.builder_states[name]))
+        global_pole.positives = self.global_pole.positives.copy()
+        global_pole.negatives = self.global_pole.negatives.copy()
+        global_pole.evens = self.global_pole.evens
+        global_pole.odds = self.global_pole.odds
+        for pool, saved in zip(sector_pools, self.sector_pools):
+            pool.clear()
+            pool.update(saved)
+
+
+def copy_builder_state(state):
+    return {k: v.copy() if isinstance(v, (list, dict)) else v for k, v in state.items()}
+
+
+# retries a failed phase from its checkpoint - the rng has moved on, so each retry explores a different branch
+def assign_with_checkpoint(phase, stats, dungeon_map, global_pole, sector_pools, assignment, retries=3):
+    checkpoint = AssignmentCheckpoint(dungeon_map, global_pole, sector_pools)
+    attempt = 0
+    while True:
+        start = time.process_time()
+        try:
+            assignment()
+            stats.record(phase, start)
+            return
+        except NeutralizingException:
+            stats.record(phase, start)
+            if attempt >= retries:
+                raise
+            attempt += 1
+            stats.rollbacks += 1
+            checkpoint.restore(dungeon_map, global_pole, sector_pools)
+
+
 def identify_destination_sectors(accessible_sectors, reverse_d_map, dungeon_map, connections, dungeon_entrances, split_dungeon_entrances):
     accessible_overworld, found_connections, explored = set(), set(), False
 
@@ -1594,26 +1812,12 @@ def ensure_crystal_switches_reachable(dungeon_map, crystal_switches, polarized_s
         valid_builders = []
         for builder in invalid_builders:
             entrance_sectors = []
-            reachable_crystals = defaultdict()
+            reachable_crystals = set()
             for sector in builder.sectors:
-                if sector.equations is None:
-                    sector.equations = calc_sector_equations(sector, builder)
-                if sector.is_entrance_sector() and not sector.destination_entrance:
-                    need_switch = True
-                    for region in sector.get_start_regions():
-                        if region.crystal_switch:
-                            need_switch = False
-                            break
-                    any_benefit = False
-                    for eq in sector.equations:
-                        if len(eq.benefit) > 0:
-                            any_benefit = True
-                            break
-                    if need_switch and any_benefit:
-                        entrance_sectors.append(sector)
-                for eq in sector.equations:
-                    if eq.c_switch:
-                        reachable_crystals[hook_from_door(eq.door)] = True
+                features = crystal_features.get(sector, builder)
+                if sector.is_entrance_sector() and not sector.destination_entrance and features.needs_switch:
+                    entrance_sectors.append(sector)
+                reachable_crystals.update(features.switch_hooks)
             valid_ent_sectors = []
             for entrance_sector in entrance_sectors:
                 other_sectors = [x for x in builder.sectors if x != entrance_sector]
@@ -1648,38 +1852,31 @@ def ensure_crystal_switches_reachable(dungeon_map, crystal_switches, polarized_s
 
 
 def is_c_switch_reachable(entrance_sector, reachable_crystals, other_sectors):
-    current_access = {}
-    for eq in entrance_sector.equations:
-        if eq.total_cost() <= 0:
-            for key, door_list in eq.benefit.items():
-                for door in door_list:
-                    if door not in eq.crystal_blocked.keys() or eq.crystal_blocked[door] != CrystalBarrier.Blue:
-                        current_access[key] = True
-                        break
-    for key, flag in current_access.items():
-        if opposite_h_type(key) in reachable_crystals.keys():
-            return True, {}
-    changed = True
-    while changed:
-        changed = False
-        for sector in other_sectors:
-            for eq in sector.equations:
-                key, cost_door = eq.cost
-                if key in current_access.keys() and current_access[key]:
-                    for bene_key, door_list in eq.benefit.items():
-                        for door in door_list:
-                            block_dict = eq.crystal_blocked
-                            if door not in block_dict.keys() or block_dict[door] != CrystalBarrier.Blue:
-                                if bene_key not in current_access.keys():
-                                    current_access[bene_key] = True
-                                    changed = True
-                                    break
-    for key, flag in current_access.items():
-        if opposite_h_type(key) in reachable_crystals.keys():
-            return True, {}
+    current_access = set(crystal_features.get(entrance_sector).open_access)
+    if access_reaches_crystal(current_access, reachable_crystals):
+        return True, set()
+    links = defaultdict(set)
+    for sector in other_sectors:
+        for key, opened in crystal_features.get(sector).links.items():
+            links[key].update(opened)
+    queue = deque(current_access)
+    while len(queue) > 0:
+        key = queue.popleft()
+        for bene_key in links[key] - current_access:
+            current_access.add(bene_key)
+            queue.append(bene_key)
+    if access_reaches_crystal(current_access, reachable_crystals):
+        return True, set()
     return False, current_access
 
 
+def access_reaches_crystal(access, reachable_crystals):
+    for key in access:
+        if opposite_h_type(key) in reachable_crystals:
+            return True
+    return False
+
+
 def find_pol_cand_for_c_switch(access, reachable_crystals, polarized_candidates):
     candidates = []
     for sector in polarized_candidates:
@@ -1689,16 +1886,10 @@ def find_pol_cand_for_c_switch(access, reachable_crystals, polarized_candidates)
 
 
 def pol_cand_matches_access_reach(sector, access, reachable_crystals):
-    if sector.equations is None:
-        sector.equations = calc_sector_equations(sector, None)
-    for eq in sector.equations:
-        key, cost_door = eq.cost
-        if key in access.keys() and access[key]:
-            for bene_key, door_list in eq.benefit.items():
-                for door in door_list:
-                    if door not in eq.crystal_blocked.keys() or eq.crystal_blocked[door] != CrystalBarrier.Blue:
-                        if opposite_h_type(bene_key) in reachable_crystals.keys():
-                            return True
+    links = crystal_features.get(sector).links
+    for key in access:
+        if key in links and access_reaches_crystal(links[key], reachable_crystals):
+            return True
     return False
 
 
@@ -1711,13 +1902,57 @@ def find_crystal_cand(access, crystal_switches):
 
 
 def crystal_cand_matches_access(sector, access):
-    if sector.equations is None:
-        sector.equations = calc_sector_equations(sector, None)
-    for eq in sector.equations:
-        key, cost_door = eq.cost
-        if key in access.keys() and access[key] and eq.c_switch and len(sector.outstanding_doors) > 1:
-            return True
-    return False
+    return not crystal_features.get(sector).switch_costs.isdisjoint(access)
+
+
+class CrystalFeatures(object):
+    # crystal facts about a sector, these only depend on its equations which are fixed once calculated
+    def __init__(self, sector):
+        self.switch_hooks = set()  # hooks of the doors that lead to a crystal switch
+        self.open_access = set()  # hooks opened by the free equations
+        self.links = defaultdict(set)  # cost hook -> hooks opened by paying it
+        self.switch_costs = set()  # cost hooks that reach a switch the sector can be passed through
+        self.needs_switch = False
+        any_benefit = False
+        for eq in sector.equations:
+            if len(eq.benefit) > 0:
+                any_benefit = True
+            if eq.c_switch:
+                self.switch_hooks.add(hook_from_door(eq.door))
+            opened = set()
+            for bene_key, door_list in eq.benefit.items():
+                for door in door_list:
+                    if door not in eq.crystal_blocked.keys() or eq.crystal_blocked[door] != CrystalBarrier.Blue:
+                        opened.add(bene_key)
+                        break
+            key, cost_door = eq.cost
+            if eq.total_cost() <= 0:
+                self.open_access.update(opened)
+            else:
+                self.links[key].update(opened)
+                if eq.c_switch and len(sector.outstanding_doors) > 1:
+                    self.switch_costs.add(key)
+        if any_benefit and sector.is_entrance_sector():
+            self.needs_switch = not any(region.crystal_switch for region in sector.get_start_regions())
+
+
+class CrystalFeatureTable(object):
+    # built up once per player, the crystal checks are re-run on every assignment attempt
+    def __init__(self):
+        self.features = {}
+
+    def clear(self):
+        self.features.clear()
+
+    def get(self, sector, builder=None):
+        if sector not in self.features:
+            if sector.equations is None:
+                sector.equations = calc_sector_equations(sector, builder)
+            self.features[sector] = CrystalFeatures(sector)
+        return self.features[sector]
+
+
+crystal_features = CrystalFeatureTable()
 
 
 def assign_crystal_barrier_sectors(dungeon_map, crystal_barriers, global_pole):
@@ -3290,8 +3525,9 @@ def resolve_equations(builder, sector_list):
         current_access[builder.name] = DungeonAccess()
 
     # resolve all that provide more access
-    free_sector, eq_list, free_eq = find_free_equation(equations)
-    while free_eq is not None:
+    for free_sector, eq_list, free_eq in find_free_equations(equations):
+        if free_eq not in eq_list:
+            continue  # resolved or reached already
         if free_sector in sector_split.keys():
             access_id = sector_split[free_sector]
             access = current_access[access_id]
@@ -3299,7 +3535,6 @@ def resolve_equations(builder, sector_list):
             access_id = next(iter(current_access.keys()))
             access = current_access[access_id]
         resolve_equation(free_eq, eq_list, free_sector, access_id, access, equations)
-        free_sector, eq_list, free_eq = find_free_equation(equations)
     while len(equations) > 0:
         valid_access = next_access(current_access)
         eq, eq_list, sector, access, access_id = None, None, None, None, None
@@ -3345,6 +3580,13 @@ def next_access(current_access):
 # 0-benefit transforms (how to pick between these?)
 # negative benefit transforms (dead end)
 def find_priority_equation(equations, access_id, current_access):
+    profits = {}  # access doesn't change while picking, so each profit is worked out once
+
+    def profit_of(eq):
+        if eq not in profits:
+            profits[eq] = eq.profit(current_access)
+        return profits[eq]
+
     flex = calc_flex(equations, current_access)
     required = calc_required(equations, current_access)
     wanted_candidates = []
@@ -3353,10 +3595,10 @@ def find_priority_equation(equations, access_id, current_access):
     local_profit_map = {}
 
     for sector, eq_list in equations.items():
-        eq_list.sort(key=lambda eq: eq.profit(current_access), reverse=True)
+        eq_list.sort(key=profit_of, reverse=True)
         best_local_profit = None
         for eq in eq_list:
-            profit = eq.profit(current_access)
+            profit = profit_of(eq)
             if current_access.can_cover_equation(eq) and (eq.access_id is None or eq.access_id == access_id):
                 # if eq.neutral_profit() or eq.neutral():
                 #     return eq, eq_list, sector  # don't need to compare - just use it now
@@ -3379,7 +3621,7 @@ def find_priority_equation(equations, access_id, current_access):
     if len(filtered_candidates) == 1:
         return filtered_candidates[0]
 
-    neutral_candidates = [x for x in filtered_candidates if (x[0].neutral_profit() or x[0].neutral()) and x[0].profit(current_access) == local_profit_map[x[2]]]
+    neutral_candidates = [x for x in filtered_candidates if (x[0].neutral_profit() or x[0].neutral()) and profit_of(x[0]) == local_profit_map[x[2]]]
     if len(neutral_candidates) == 0:
         neutral_candidates = filtered_candidates
     if len(neutral_candidates) == 1:
@@ -3394,7 +3636,7 @@ def find_priority_equation(equations, access_id, current_access):
     triplet_candidates = []
     best_profit = None
     for eq, eq_list, sector in filtered_candidates:
-        profit = eq.profit(current_access)
+        profit = profit_of(eq)
         if best_profit is None or profit >= best_profit:
             if best_profit is None or profit > best_profit:
                 triplet_candidates = [(eq, eq_list, sector)]
@@ -3430,7 +3672,7 @@ def find_priority_equation(equations, access_id, current_access):
     if len(flexible_candidates) == 1:
         return flexible_candidates[0]
 
-    good_local_candidates = [x for x in flexible_candidates if local_profit_map[x[2]] == x[0].profit(current_access)]
+    good_local_candidates = [x for x in flexible_candidates if local_profit_map[x[2]] == profit_of(x[0])]
     if len(good_local_candidates) == 0:
         good_local_candidates = flexible_candidates
     if len(good_local_candidates) == 1:
@@ -3477,10 +3719,17 @@ def find_cost_point(eq_triplet, access):
 
 
 def find_greedy_equation(equations, access_id, current_access, sector_split):
+    profits = {}  # access doesn't change while picking, so each profit is worked out once
+
+    def profit_of(eq):
+        if eq not in profits:
+            profits[eq] = eq.profit(current_access)
+        return profits[eq]
+
     all_candidates = []
     for sector, eq_list in equations.items():
         if sector not in sector_split.keys() or sector_split[sector] == access_id:
-            eq_list.sort(key=lambda eq: eq.profit(current_access), reverse=True)
+            eq_list.sort(key=profit_of, reverse=True)
             for eq in eq_list:
                 if current_access.can_cover_equation(eq) and (eq.access_id is None or eq.access_id == access_id):
                     all_candidates.append((eq, eq_list, sector))
@@ -3488,7 +3737,7 @@ def find_greedy_equation(equations, access_id, current_access, sector_split):
         return None, None, None  # can't pay for anything
     if len(all_candidates) == 1:
         return all_candidates[0]
-    filtered_candidates = [x for x in all_candidates if x[0].profit(current_access) + 2 >= len(x[2].outstanding_doors)]
+    filtered_candidates = [x for x in all_candidates if profit_of(x[0]) + 2 >= len(x[2].outstanding_doors)]
     if len(filtered_candidates) == 0:
         filtered_candidates = all_candidates  # terrible! ugly dead ends
     if len(filtered_candidates) == 1:
@@ -3497,7 +3746,7 @@ def find_greedy_equation(equations, access_id, current_access, sector_split):
     triplet_candidates = []
     worst_profit = None
     for eq, eq_list, sector in filtered_candidates:
-        profit = eq.profit(current_access)
+        profit = profit_of(eq)
         if worst_profit is None or profit <= worst_profit:
             if worst_profit is None or profit < worst_profit:
                 triplet_candidates = [(eq, eq_list, sector)]
@@ -3636,12 +3885,14 @@ def resolve_equation(equation, eq_list, sector, access_id, current_access, equat
             eq.access_id = access_id
 
 
-def find_free_equation(equations):
+# costs never change and free equations are only ever removed, so they can be listed once in order
+def find_free_equations(equations):
+    free_equations = []
     for sector, eq_list in equations.items():
         for eq in eq_list:
             if eq.total_cost() <= 0:
-                return sector, eq_list, eq
-    return None, None, None
+                free_equations.append((sector, eq_list, eq))
+    return free_equations
 
 
 def copy_door_equations(builder, sector_list):
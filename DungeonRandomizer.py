@@ -7,15 +7,49 @@ import random
 import textwrap
 import shlex
 import sys
+import subprocess
 
 from source.classes.BabelFish import BabelFish
-import source.classes.diags as diagnostics
 
 from CLI import parse_cli, get_args_priority
-from Main import main, EnemizerError, __version__
-from Rom import get_sprite_from_name
 from Utils import is_bundled, close_console
-from Fill import FillError
+
+# generation modules are heavy to import, they are only loaded once a run actually needs them
+generation_modules = ['BaseClasses', 'Regions', 'Doors', 'DungeonGenerator', 'KeyDoorShuffle', 'DoorShuffle',
+                      'EntranceShuffle', 'Text', 'Rom', 'Fill', 'Main']
+
+
+# import time expected for DungeonRandomizer and everything it loads before a run starts, in microseconds
+# only reported, timings on shared machines vary too much to fail on
+startup_import_budget = 100000
+
+
+def profile_startup():
+    # usage: py DungeonRandomizer.py --profile_startup
+    # forwards python -X importtime output for the startup imports, then for the generation modules
+    # fails when the startup imports pull in a generation module, going over budget is only reported
+    statement = 'import sys, DungeonRandomizer; print("generation modules:", file=sys.stderr); import %s' % ', '.join(generation_modules)
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement], cwd=os.path.dirname(os.path.abspath(__file__)),
+                            stderr=subprocess.PIPE, universal_newlines=True)
+    startup_time, eager_modules, generation = None, [], False
+    for line in result.stderr.splitlines():
+        print(line, file=sys.stderr)
+        if line == 'generation modules:':
+            generation = True
+        elif not generation and line.startswith('import time:') and line.count('|') == 2:
+            _, cumulative, package = line.split('|')
+            if package.strip() == 'DungeonRandomizer' and cumulative.strip().isdigit():
+                startup_time = int(cumulative)
+            elif package.strip() in generation_modules:
+                eager_modules.append(package.strip())
+    if result.returncode != 0 or startup_time is None:
+        sys.exit('Could not profile imports')
+    print('startup imports: %d us, budget %d us%s' % (startup_time, startup_import_budget,
+          ' (over budget)' if startup_time > startup_import_budget else ''), file=sys.stderr)
+    if eager_modules:
+        sys.exit('Generation modules imported at startup: %s' % ', '.join(eager_modules))
+    sys.exit(0)
+
 
 def start():
     args = parse_cli(None)
@@ -23,10 +57,17 @@ def start():
     # print diagnostics
     # usage: py DungeonRandomizer.py --diags
     if args.diags:
+        import source.classes.diags as diagnostics
+        from Main import __version__
         diags = diagnostics.output(__version__)
         print("\n".join(diags))
         sys.exit(0)
 
+    # check the import time budget
+    # usage: py DungeonRandomizer.py --profile_startup
+    if args.profile_startup:
+        profile_startup()
+
     if is_bundled() and len(sys.argv) == 1:
         # for the bundled builds, if we have no arguments, the user
         # probably wants the gui. Users of the bundled build who want the command line
@@ -41,6 +82,7 @@ def start():
     if not args.jsonout and not os.path.isfile(args.rom):
         input('Could not find valid base rom for patching at expected path %s. Please run with -h to see help for further information. \nPress Enter to exit.' % args.rom)
         sys.exit(1)
+    from Rom import get_sprite_from_name
     if any([sprite is not None and not os.path.isfile(sprite) and not get_sprite_from_name(sprite) for sprite in args.sprite.values()]):
         if not args.jsonout:
             input('Could not find link sprite sheet at given location. \nPress Enter to exit.')
@@ -58,6 +100,8 @@ def start():
         lang = priority["load"].lang
     fish = BabelFish(lang=lang)
 
+    from Main import main, EnemizerError
+    from Fill import FillError
     if args.gui:
         from Gui import guiMain
         guiMain(args)
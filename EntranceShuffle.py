@@ -1,9 +1,26 @@
+import logging
 import random
 
 # ToDo: With shuffle_ganon option, prevent gtower from linking to an exit only location through a 2 entrance cave.
 
 
+class EntranceStats(object):
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.assignments = 0
+        self.fit_checks = 0
+        self.backtracks = 0
+
+    def report(self, player):
+        logging.getLogger('').debug('Entrance shuffle for player %s: %s assignments, %s fit checks, %s backtracks',
+                                    player, self.assignments, self.fit_checks, self.backtracks)
+
+
 def link_entrances(world, player):
+    world.entrance_stats[player].reset()
     connect_two_way(world, 'Links House', 'Links House Exit', player) # unshuffled. For now
     connect_exit(world, 'Chris Houlihan Room Exit', 'Links House', player) # should always match link's house, except for plandos
 
@@ -659,6 +676,7 @@ def link_entrances(world, player):
             try:
                 cave = extract_reachable_exit(primary)
             except RuntimeError:
+                world.entrance_stats[player].backtracks += 1
                 cave = extract_reachable_exit(secondary)
 
             exit = cave[-1]
@@ -1078,7 +1096,10 @@ def link_entrances(world, player):
     if world.get_entrance('Ganons Tower', player).connected_region.name != 'Ganons Tower Portal':
         world.ganonstower_vanilla[player] = False
 
+    world.entrance_stats[player].report(player)
+
 def link_inverted_entrances(world, player):
+    world.entrance_stats[player].reset()
     # Link's house shuffled freely, Houlihan set in mandatory_connections 
 
     Dungeon_Exits = Inverted_Dungeon_Exits_Base.copy()
@@ -1782,6 +1803,8 @@ def link_inverted_entrances(world, player):
     if world.get_entrance('Inverted Ganons Tower', player).connected_region.name != 'GT Lobby':
         world.ganonstower_vanilla[player] = False
 
+    world.entrance_stats[player].report(player)
+
 
 def connect_custom(world, player):
     if hasattr(world, 'custom_entrances') and world.custom_entrances[player]:
@@ -1813,6 +1836,7 @@ def connect_entrance(world, entrancename, exitname, player):
     addresses = door_addresses[entrance.name][0]
 
     entrance.connect(region, addresses, target)
+    world.entrance_stats[player].assignments += 1
     world.spoiler.set_entrance(entrance.name, exit.name if exit is not None else region.name, 'entrance', player)
 
 def connect_exit(world, exitname, entrancename, player):
@@ -1824,6 +1848,7 @@ def connect_exit(world, exitname, entrancename, player):
         exit.connected_region.entrances.remove(exit)
 
     exit.connect(entrance.parent_region, door_addresses[entrance.name][1], exit_ids[exit.name][1])
+    world.entrance_stats[player].assignments += 1
     world.spoiler.set_entrance(entrance.name, exit.name, 'exit', player)
 
 
@@ -1839,6 +1864,7 @@ def connect_two_way(world, entrancename, exitname, player):
 
     entrance.connect(exit.parent_region, door_addresses[entrance.name][0], exit_ids[exit.name][0])
     exit.connect(entrance.parent_region, door_addresses[entrance.name][1], exit_ids[exit.name][1])
+    world.entrance_stats[player].assignments += 1
     world.spoiler.set_entrance(entrance.name, exit.name, 'both', player)
 
 
@@ -2002,18 +2028,37 @@ def connect_caves(world, lw_entrances, dw_entrances, caves, player):
         cave = caves.pop(cave_candidate[0])
 
         target = lw_entrances if random.randint(0, 1) == 0 else dw_entrances
+        other = lw_entrances if target is dw_entrances else dw_entrances
         if isinstance(cave, str):
             cave = (cave,)
 
-        # check if we can still fit the cave into our target group
+        # check if we can still fit the cave into our target group, and the remaining caves around it
         if len(target) < len(cave):
             # need to use other set
-            target = lw_entrances if target is dw_entrances else dw_entrances
+            target = other
+        else:
+            world.entrance_stats[player].fit_checks += 1
+            if not caves_fit(caves, len(target) - len(cave), len(other)):
+                # this world would strand a later cave, so the cave goes to the other one
+                world.entrance_stats[player].backtracks += 1
+                target = other
 
         for exit in cave:
             connect_two_way(world, target.pop(), exit, player)
 
 
+def caves_fit(caves, first_free, second_free):
+    # whether the caves can be split across two entrance groups without breaking any cave up
+    sizes = [1 if isinstance(cave, str) else len(cave) for cave in caves]
+    low = max(0, sum(sizes) - second_free)
+    if low > first_free:
+        return False
+    reachable = 1
+    for size in sizes:
+        reachable |= reachable << size
+    return reachable >> low & ((1 << (first_free - low + 1)) - 1) != 0
+
+
 def connect_doors(world, doors, targets, player):
     """This works inplace"""
     random.shuffle(doors)
@@ -199,6 +199,8 @@ def fill_restrictive(world, base_state, locations, itempool, keys_in_itempool =
 
                 for location in locations:
                     if item_to_place.smallkey or item_to_place.bigkey:  # a better test to see if a key can go there
+                        if not could_fill(location, item_to_place, maximum_exploration_state, single_player_placement):
+                            continue  # skip the state copy, this location can never take the key
                         location.item = item_to_place
                         test_state = maximum_exploration_state.copy()
                         test_state.stale[item_to_place.player] = True
@@ -229,6 +231,12 @@ def fill_restrictive(world, base_state, locations, itempool, keys_in_itempool =
     itempool.extend(unplaced_items)
 
 
+def could_fill(location, item, state, single_player_placement):
+    if single_player_placement and location.player != item.player:
+        return False
+    return location.always_allow(state, item) or (location.parent_region.can_fill(item) and location.item_rule(item))
+
+
 def valid_key_placement(item, location, itempool, world):
     if (not item.smallkey and not item.bigkey) or item.player != location.player or world.retro[item.player] or world.logic[item.player] == 'nologic':
         return True
@@ -374,11 +382,38 @@ def flood_items(world):
                 itempool.remove(item_to_place)
                 break
 
+class LocationPool(object):
+    # ordered pool of locations with membership kept in a bytearray indexed by location id
+
+    def __init__(self, location_ids, locations, members=None):
+        self.location_ids = location_ids
+        self.locations = locations
+        if members is None:
+            members = bytearray(len(location_ids))
+            for location in locations:
+                members[location_ids[location]] = 1
+        self.members = members
+
+    def copy(self):
+        return LocationPool(self.location_ids, self.locations.copy(), self.members.copy())
+
+    def __contains__(self, location):
+        return self.members[self.location_ids[location]] == 1
+
+    def remove_all(self, locations):
+        for location in locations:
+            self.members[self.location_ids[location]] = 0
+        self.locations = [l for l in self.locations if self.members[self.location_ids[l]]]
+
+
 def balance_multiworld_progression(world):
     state = CollectionState(world)
     checked_locations = []
-    unchecked_locations = world.get_locations().copy()
+    all_locations = world.get_locations()
+    location_ids = {location: i for i, location in enumerate(all_locations)}
+    unchecked_locations = all_locations.copy()
     random.shuffle(unchecked_locations)
+    unchecked_locations = LocationPool(location_ids, unchecked_locations)
 
     reachable_locations_count = {}
     for player in range(1, world.players + 1):
@@ -389,9 +424,9 @@ def balance_multiworld_progression(world):
         return [loc for loc in locations if sphere_state.can_reach(loc) and sphere_state.not_flooding_a_key(sphere_state.world, loc)]
 
     while True:
-        sphere_locations = get_sphere_locations(state, unchecked_locations)
+        sphere_locations = get_sphere_locations(state, unchecked_locations.locations)
+        unchecked_locations.remove_all(sphere_locations)
         for location in sphere_locations:
-            unchecked_locations.remove(location)
             reachable_locations_count[location.player] += 1
 
         if checked_locations:
@@ -410,16 +445,16 @@ def balance_multiworld_progression(world):
                             balancing_state.collect(location.item, True, location)
                             if location.item.player in balancing_players and not location.locked:
                                 candidate_items.append(location)
-                    balancing_sphere = get_sphere_locations(balancing_state, balancing_unchecked_locations)
+                    balancing_sphere = get_sphere_locations(balancing_state, balancing_unchecked_locations.locations)
+                    balancing_unchecked_locations.remove_all(balancing_sphere)
                     for location in balancing_sphere:
-                        balancing_unchecked_locations.remove(location)
                         balancing_reachables[location.player] += 1
                     if world.has_beaten_game(balancing_state) or all([reachables >= threshold for reachables in balancing_reachables.values()]):
                         break
                     elif not balancing_sphere:
                         raise RuntimeError('Not all required items reachable. Something went terribly wrong here.')
 
-                unlocked_locations = [l for l in unchecked_locations if l not in balancing_unchecked_locations]
+                unlocked_locations = [l for l in unchecked_locations.locations if l not in balancing_unchecked_locations]
                 items_to_replace = []
                 for player in balancing_players:
                     locations_to_test = [l for l in unlocked_locations if l.player == player]
@@ -456,8 +491,9 @@ def balance_multiworld_progression(world):
                     state.collect(new_location.item, True, new_location)
                     replaced_items = True
                 if replaced_items:
-                    for location in get_sphere_locations(state, [l for l in unlocked_locations if l.player in balancing_players]):
-                        unchecked_locations.remove(location)
+                    replaced_sphere = get_sphere_locations(state, [l for l in unlocked_locations if l.player in balancing_players])
+                    unchecked_locations.remove_all(replaced_sphere)
+                    for location in replaced_sphere:
                         reachable_locations_count[location.player] += 1
                         sphere_locations.append(location)
 
@@ -5,7 +5,7 @@ from Regions import create_lw_region, create_dw_region, create_cave_region, crea
 
 def create_inverted_regions(world, player):
 
-    world.regions += [
+    regions = [
         create_menu_region(player, 'Menu', None, ['Links House S&Q', 'Dark Sanctuary S&Q', 'Old Man S&Q', 'Castle Ledge S&Q']),
         create_lw_region(player, 'Light World', ['Mushroom', 'Bottle Merchant', 'Flute Spot', 'Sunken Treasure', 'Purple Chest', 'Bombos Tablet'],
                          ["Blinds Hideout", "Hyrule Castle Secret Entrance Drop", 'Kings Grave Outer Rocks', 'Dam',
@@ -208,6 +208,8 @@ def create_inverted_regions(world, player):
         # to simplify flute connections
         create_cave_region(player, 'The Sky', 'A Dark Sky', None, ['DDM Landing','NEDW Landing', 'WDW Landing', 'SDW Landing', 'EDW Landing', 'DD Landing', 'DLHL Landing']) 
     ]
+    world.regions += regions
+    world.initialize_regions(regions)
 
 
 def mark_dark_world_regions(world, player):
@@ -380,6 +380,7 @@ def set_up_take_anys(world, player):
     old_man_take_any = Region("Old Man Sword Cave", RegionType.Cave, 'the sword cave', player)
     world.regions.append(old_man_take_any)
     world.dynamic_regions.append(old_man_take_any)
+    world.initialize_regions([old_man_take_any])
 
     reg = regions.pop()
     entrance = world.get_region(reg, player).entrances[0]
@@ -401,6 +402,7 @@ def set_up_take_anys(world, player):
         take_any = Region("Take-Any #{}".format(num+1), RegionType.Cave, 'a cave of choice', player)
         world.regions.append(take_any)
         world.dynamic_regions.append(take_any)
+        world.initialize_regions([take_any])
 
         target, room_id = random.choice([(0x58, 0x0112), (0x60, 0x010F), (0x46, 0x011F)])
         reg = regions.pop()
@@ -412,8 +414,6 @@ def set_up_take_anys(world, player):
         take_any.shop.add_inventory(0, 'Blue Potion', 0, 0)
         take_any.shop.add_inventory(1, 'Boss Heart Container', 0, 0)
 
-    world.initialize_regions()
-
 
 def create_dynamic_shop_locations(world, player):
     for shop in world.shops:
@@ -17,7 +17,9 @@ class KeyLayout(object):
         self.key_logic = KeyLogic(sector.name)
 
         self.key_counters = None
+        self.counter_lattice = None
         self.flat_prop = None
+        self.door_bits = None
         self.max_chests = None
         self.max_drops = None
         self.all_chest_locations = {}
@@ -31,6 +33,7 @@ class KeyLayout(object):
     def reset(self, proposal, builder, world, player):
         self.proposal = proposal
         self.flat_prop = flatten_pair_list(self.proposal)
+        self.door_bits = door_bits(self.flat_prop)
         self.key_logic = KeyLogic(self.sector.name)
         self.max_chests = calc_max_chests(builder, self, world, player)
         self.all_locations = set()
@@ -170,6 +173,10 @@ class KeyCounter(object):
         self.important_location = False
         self.other_locations = {}
         self.important_locations = {}
+        # place in the lattice of opened door combinations, see create_key_counters
+        self.id = None
+        self.mask = None
+        self.next_counters = {}
 
     def used_smalls_loc(self, reserve=0):
         return max(self.used_keys + reserve - len(self.key_only_locations), 0)
@@ -178,6 +185,7 @@ class KeyCounter(object):
 def build_key_layout(builder, start_regions, proposal, world, player):
     key_layout = KeyLayout(builder.master_sector, start_regions, proposal)
     key_layout.flat_prop = flatten_pair_list(key_layout.proposal)
+    key_layout.door_bits = door_bits(key_layout.flat_prop)
     key_layout.max_drops = count_key_drops(key_layout.sector)
     key_layout.max_chests = calc_max_chests(builder, key_layout, world, player)
     key_layout.big_key_special = check_bk_special(key_layout.sector.region_set(), world, player)
@@ -691,9 +699,14 @@ def key_wasted(new_door, old_door, old_counter, new_counter, key_layout, world,
 
 
 def find_next_counter(new_door, old_counter, key_layout):
+    if new_door in old_counter.next_counters:
+        return old_counter.next_counters[new_door]
     proposed_doors = {**old_counter.open_doors, **dict.fromkeys([new_door, new_door.dest])}
     bk_open = old_counter.big_key_opened or new_door.bigKey
-    return find_counter(proposed_doors, bk_open, key_layout)
+    next_counter = find_counter(proposed_doors, bk_open, key_layout)
+    if old_counter.mask is not None:
+        old_counter.next_counters[new_door] = next_counter
+    return next_counter
 
 
 def check_special_locations(locations):
@@ -1038,7 +1051,7 @@ def expand_key_state(state, flat_proposal, world, player):
     while len(state.avail_doors) > 0:
         exp_door = state.next_avail_door()
         door = exp_door.door
-        connect_region = world.get_entrance(door.name, player).connected_region
+        connect_region = world.get_door_entrance(door).connected_region
         if state.validate(door, connect_region, world, player):
             state.visit_region(connect_region, key_checks=True)
             state.add_all_doors_check_keys(connect_region, flat_proposal, world, player)
@@ -1269,61 +1282,92 @@ def validate_key_layout(key_layout, world, player):
     for region in key_layout.start_regions:
         state.visit_region(region, key_checks=True)
         state.add_all_doors_check_keys(region, flat_proposal, world, player)
-    return validate_key_layout_sub_loop(key_layout, state, {}, flat_proposal, None, 0, world, player)
+    return validate_key_layout_sub_loop(key_layout, state, {}, flat_proposal, world, player)
+
+
+# depth first over the key states with an explicit stack, each frame is [state, avail small locations, children, code]
+def validate_key_layout_sub_loop(key_layout, state, checked_states, flat_proposal, world, player):
+    valid, children, avail = key_state_step(key_layout, state, flat_proposal, None, 0, world, player)
+    if children is None:
+        return valid
+    stack = [[state, avail, children, None]]
+    child_valid = None
+    while len(stack) > 0:
+        frame = stack[-1]
+        if child_valid is not None:
+            checked_states[frame[3]] = child_valid
+            if not child_valid:
+                stack.pop()
+                continue
+        parent, parent_avail, children = frame[0], frame[1], frame[2]
+        state_copy, code = next(children, (None, None))
+        if state_copy is None:
+            stack.pop()
+            child_valid = True
+            continue
+        if code in checked_states.keys():
+            child_valid = None
+            if not checked_states[code]:
+                stack.pop()
+                child_valid = False
+            continue
+        valid, grandchildren, avail = key_state_step(key_layout, state_copy, flat_proposal, parent, parent_avail,
+                                                     world, player)
+        if grandchildren is None:
+            checked_states[code] = valid
+            child_valid = None
+            if not valid:
+                stack.pop()
+                child_valid = False
+            continue
+        frame[3] = code
+        stack.append([state_copy, avail, grandchildren, None])
+        child_valid = None
+    return child_valid
 
 
-def validate_key_layout_sub_loop(key_layout, state, checked_states, flat_proposal, prev_state, prev_avail, world, player):
+# expands the state, returns whether it is valid or the states to check next
+def key_state_step(key_layout, state, flat_proposal, prev_state, prev_avail, world, player):
     expand_key_state(state, flat_proposal, world, player)
     smalls_avail = len(state.small_doors) > 0   # de-dup crystal repeats
     num_bigs = 1 if len(state.big_doors) > 0 else 0  # all or nothing
     if not smalls_avail and num_bigs == 0:
-        return True   # I think that's the end
+        return True, None, 0   # I think that's the end
     # todo: fix state to separate out these types
     ttl_locations = count_free_locations(state) if state.big_key_opened else count_locations_exclude_big_chest(state)
     ttl_small_key_only = count_small_key_only_locations(state)
     available_small_locations = cnt_avail_small_locations(ttl_locations, ttl_small_key_only, state, world, player)
     available_big_locations = cnt_avail_big_locations(ttl_locations, state, world, player)
     if invalid_self_locking_key(key_layout, state, prev_state, prev_avail, world, player):
-        return False
+        return False, None, 0
     # todo: allow more key shuffles - refine placement rules
     # if (not smalls_avail or available_small_locations == 0) and (state.big_key_opened or num_bigs == 0 or available_big_locations == 0):
     found_forced_bk = state.found_forced_bk()
     smalls_done = not smalls_avail or not enough_small_locations(state, available_small_locations)
     bk_done = state.big_key_opened or num_bigs == 0 or (available_big_locations == 0 and not found_forced_bk)
     if smalls_done and bk_done:
-        return False
-    else:
-        if smalls_avail and available_small_locations > 0:
-            for exp_door in state.small_doors:
-                state_copy = state.copy()
-                open_a_door(exp_door.door, state_copy, flat_proposal)
-                state_copy.used_smalls += 1
-                if state_copy.used_smalls > ttl_small_key_only:
-                    state_copy.used_locations += 1
-                code = state_id(state_copy, flat_proposal)
-                if code not in checked_states.keys():
-                    valid = validate_key_layout_sub_loop(key_layout, state_copy, checked_states, flat_proposal,
-                                                         state, available_small_locations, world, player)
-                    checked_states[code] = valid
-                else:
-                    valid = checked_states[code]
-                if not valid:
-                    return False
-        if not state.big_key_opened and (available_big_locations >= num_bigs > 0 or (found_forced_bk and num_bigs > 0)):
+        return False, None, 0
+    children = key_state_children(state, flat_proposal, smalls_avail, num_bigs, ttl_small_key_only,
+                                  available_small_locations, available_big_locations, found_forced_bk)
+    return True, children, available_small_locations
+
+
+def key_state_children(state, flat_proposal, smalls_avail, num_bigs, ttl_small_key_only, available_small_locations,
+                       available_big_locations, found_forced_bk):
+    if smalls_avail and available_small_locations > 0:
+        for exp_door in state.small_doors:
             state_copy = state.copy()
-            open_a_door(state.big_doors[0].door, state_copy, flat_proposal)
-            if not found_forced_bk:
+            open_a_door(exp_door.door, state_copy, flat_proposal)
+            state_copy.used_smalls += 1
+            if state_copy.used_smalls > ttl_small_key_only:
                 state_copy.used_locations += 1
-            code = state_id(state_copy, flat_proposal)
-            if code not in checked_states.keys():
-                valid = validate_key_layout_sub_loop(key_layout, state_copy, checked_states, flat_proposal,
-                                                     state, available_small_locations, world, player)
-                checked_states[code] = valid
-            else:
-                valid = checked_states[code]
-            if not valid:
-                return False
-    return True
+            yield state_copy, state_id(state_copy, flat_proposal)
+    if not state.big_key_opened and (available_big_locations >= num_bigs > 0 or (found_forced_bk and num_bigs > 0)):
+        state_copy = state.copy()
+        open_a_door(state.big_doors[0].door, state_copy, flat_proposal)
+        if not found_forced_bk:
+            state_copy.used_locations += 1
+        yield state_copy, state_id(state_copy, flat_proposal)
 
 
 def invalid_self_locking_key(key_layout, state, prev_state, prev_avail, world, player):
@@ -1371,8 +1415,11 @@ def cnt_avail_big_locations(ttl_locations, state, world, player):
     return 1 if not state.big_key_special else 0
 
 
+# every combination of opened doors reachable from the start, keyed by state_id
+# counters also land in key_layout.counter_lattice by their bit mask, so lookups don't build strings
 def create_key_counters(key_layout, world, player):
     key_counters = {}
+    key_layout.counter_lattice = {}
     flat_proposal = key_layout.flat_prop
     state = ExplorationState(dungeon=key_layout.sector.name)
     if world.doorShuffle[player] == 'vanilla':
@@ -1391,25 +1438,48 @@ def create_key_counters(key_layout, world, player):
     expand_key_state(state, flat_proposal, world, player)
     code = state_id(state, key_layout.flat_prop)
     key_counters[code] = create_key_counter(state, key_layout, world, player)
+    add_to_lattice(key_counters[code], key_layout)
     queue = deque([(key_counters[code], state)])
     while len(queue) > 0:
         next_key_counter, parent_state = queue.popleft()
         for door in next_key_counter.child_doors:
-            child_state = parent_state.copy()
             if door.bigKey or door.name in special_big_key_doors:
                 key_layout.key_logic.bk_doors.add(door)
             # open the door, if possible
-            if not door.bigKey or not child_state.big_key_special or child_state.visited_at_all(special_region):
-                open_a_door(door, child_state, flat_proposal)
-                expand_key_state(child_state, flat_proposal, world, player)
-                code = state_id(child_state, key_layout.flat_prop)
-                if code not in key_counters.keys():
+            if not door.bigKey or not parent_state.big_key_special or parent_state.visited_at_all(special_region):
+                # exploring never opens doors, so where the door leads in the lattice is known up front
+                if opened_mask(door, next_key_counter, parent_state, key_layout) not in key_layout.counter_lattice:
+                    child_state = parent_state.copy()
+                    open_a_door(door, child_state, flat_proposal)
+                    code = state_id(child_state, key_layout.flat_prop)
+                    expand_key_state(child_state, flat_proposal, world, player)
                     child_kr = create_key_counter(child_state, key_layout, world, player)
                     key_counters[code] = child_kr
+                    add_to_lattice(child_kr, key_layout)
                     queue.append((child_kr, child_state))
     return key_counters
 
 
+# the mask open_a_door would leave the parent state with
+def opened_mask(door, parent_counter, parent_state, key_layout):
+    bits = key_layout.door_bits
+    if door.bigKey or door.name in special_big_key_doors:
+        mask = parent_counter.mask | 1
+        for exp_door in parent_state.big_doors:
+            mask |= bits.get(exp_door.door, 0)
+        return mask
+    mask = parent_counter.mask | bits.get(door, 0)
+    if door.dest in bits and door.type != DoorType.SpiralStairs:
+        mask |= bits[door.dest]
+    return mask
+
+
+def add_to_lattice(counter, key_layout):
+    counter.id = len(key_layout.counter_lattice)
+    counter.mask = counter_mask(counter.open_doors, counter.big_key_opened, key_layout)
+    key_layout.counter_lattice[counter.mask] = counter
+
+
 def create_key_counter(state, key_layout, world, player):
     key_counter = KeyCounter(key_layout.max_chests)
     key_counter.child_doors.update(dict.fromkeys(unique_doors(state.small_doors+state.big_doors)))
@@ -1473,9 +1543,10 @@ def dict_intersection(dict_a, dict_b):
 
 
 def state_id(state, flat_proposal):
+    opened_doors = set(state.opened_doors)
     s_id = '1' if state.big_key_opened else '0'
     for d in flat_proposal:
-        s_id += '1' if d in state.opened_doors else '0'
+        s_id += '1' if d in opened_doors else '0'
     return s_id
 
 
@@ -1498,13 +1569,13 @@ def find_counter(opened_doors, bk_hint, key_layout, raise_on_error=True):
 
 
 def find_counter_hint(opened_doors, bk_hint, key_layout):
-    cid = counter_id(opened_doors, bk_hint, key_layout.flat_prop)
-    if cid in key_layout.key_counters.keys():
-        return key_layout.key_counters[cid]
+    mask = counter_mask(opened_doors, bk_hint, key_layout)
+    if mask in key_layout.counter_lattice:
+        return key_layout.counter_lattice[mask]
     if not bk_hint:
-        cid = counter_id(opened_doors, True, key_layout.flat_prop)
-        if cid in key_layout.key_counters.keys():
-            return key_layout.key_counters[cid]
+        mask |= 1
+        if mask in key_layout.counter_lattice:
+            return key_layout.counter_lattice[mask]
     return None
 
 
@@ -1525,7 +1596,23 @@ def counter_id(opened_doors, bk_unlocked, flat_proposal):
 
 
 def cid(counter, key_layout):
-    return counter_id(counter.open_doors, counter.big_key_opened, key_layout.flat_prop)
+    if counter.mask is not None:
+        return counter.mask
+    return counter_mask(counter.open_doors, counter.big_key_opened, key_layout)
+
+
+# bit 0 is the big key, the rest follow flat_prop like counter_id does
+def door_bits(flat_proposal):
+    return {d: 1 << (i + 1) for i, d in enumerate(flat_proposal)}
+
+
+def counter_mask(opened_doors, bk_unlocked, key_layout):
+    mask = 1 if bk_unlocked else 0
+    bits = key_layout.door_bits
+    for d in opened_doors:
+        if d in bits:
+            mask |= bits[d]
+    return mask
 
 
 # class SoftLockException(Exception):
@@ -5,10 +5,11 @@ import json
 import logging
 import os
 import random
+import sys
 import time
 import zlib
 
-from BaseClasses import World, CollectionState, Item, Region, Location, Shop, Entrance
+from BaseClasses import World, CollectionState
 from Items import ItemFactory
 from KeyDoorShuffle import validate_key_placement
 from PotShuffle import shuffle_pots
@@ -17,7 +18,7 @@ from InvertedRegions import create_inverted_regions, mark_dark_world_regions
 from EntranceShuffle import link_entrances, link_inverted_entrances
 from Rom import patch_rom, patch_race_rom, patch_enemizer, apply_rom_settings, LocalRom, JsonRom, get_hash_string
 from Doors import create_doors
-from DoorShuffle import link_doors, connect_portal_copy
+from DoorShuffle import link_doors
 from RoomData import create_rooms
 from Rules import set_rules
 from Dungeons import create_dungeons, fill_dungeons, fill_dungeons_restrictive
@@ -43,6 +44,8 @@ def main(args, seed=None, fish=None):
                   args.difficulty, args.item_functionality, args.timer, args.progressive, args.goal, args.algorithm,
                   args.accessibility, args.shuffleganon, args.retro, args.custom, args.customitemarray, args.hints)
     logger = logging.getLogger('')
+    if args.count_lookups:
+        world.count_lookups()
     if seed is None:
         random.seed(None)
         world.seed = random.randint(0, 999999999)
@@ -325,14 +328,10 @@ def main(args, seed=None, fish=None):
         create_playthrough(world)
 
     if args.jsonout:
-        print(json.dumps({**jsonout, 'spoiler': world.spoiler.to_json()}))
+        write_jsonout(jsonout, world.spoiler, sys.stdout)
     elif args.create_spoiler:
         logger.info(world.fish.translate("cli","cli","patching.spoiler"))
-        if args.jsonout:
-            with open(output_path('%s_Spoiler.json' % outfilebase), 'w') as outfile:
-              outfile.write(world.spoiler.to_json())
-        else:
-            world.spoiler.to_file(output_path('%s_Spoiler.txt' % outfilebase))
+        world.spoiler.to_file(output_path('%s_Spoiler.txt' % outfilebase))
 
     YES = world.fish.translate("cli","cli","yes")
     NO = world.fish.translate("cli","cli","no")
@@ -345,6 +344,8 @@ def main(args, seed=None, fish=None):
     logger.info(world.fish.translate("cli","cli","used.enemizer") % (YES if enemized else NO))
     logger.info(world.fish.translate("cli","cli","seed") + ": %d", world.seed)
     logger.info(world.fish.translate("cli","cli","total.time"), time.perf_counter() - start)
+    if world.lookup_stats is not None:
+        world.lookup_stats.report(logger)
 
 #    print_wiki_doors_by_room(dungeon_regions,world,1)
 #    print_wiki_doors_by_region(dungeon_regions,world,1)
@@ -352,170 +353,53 @@ def main(args, seed=None, fish=None):
     return world
 
 
-def copy_world(world):
-    # ToDo: Not good yet
-    ret = World(world.players, world.shuffle, world.doorShuffle, world.logic, world.mode, world.swords,
-                world.difficulty, world.difficulty_adjustments, world.timer, world.progressive, world.goal, world.algorithm,
-                world.accessibility, world.shuffle_ganon, world.retro, world.custom, world.customitemarray, world.hints)
-    ret.teams = world.teams
-    ret.player_names = copy.deepcopy(world.player_names)
-    ret.remote_items = world.remote_items.copy()
-    ret.required_medallions = world.required_medallions.copy()
-    ret.swamp_patch_required = world.swamp_patch_required.copy()
-    ret.ganon_at_pyramid = world.ganon_at_pyramid.copy()
-    ret.powder_patch_required = world.powder_patch_required.copy()
-    ret.ganonstower_vanilla = world.ganonstower_vanilla.copy()
-    ret.treasure_hunt_count = world.treasure_hunt_count.copy()
-    ret.treasure_hunt_icon = world.treasure_hunt_icon.copy()
-    ret.sewer_light_cone = world.sewer_light_cone.copy()
-    ret.light_world_light_cone = world.light_world_light_cone
-    ret.dark_world_light_cone = world.dark_world_light_cone
-    ret.seed = world.seed
-    ret.can_access_trock_eyebridge = world.can_access_trock_eyebridge.copy()
-    ret.can_access_trock_front = world.can_access_trock_front.copy()
-    ret.can_access_trock_big_chest = world.can_access_trock_big_chest.copy()
-    ret.can_access_trock_middle = world.can_access_trock_middle.copy()
-    ret.can_take_damage = world.can_take_damage
-    ret.difficulty_requirements = world.difficulty_requirements.copy()
-    ret.fix_fake_world = world.fix_fake_world.copy()
-    ret.lamps_needed_for_dark_rooms = world.lamps_needed_for_dark_rooms
-    ret.mapshuffle = world.mapshuffle.copy()
-    ret.compassshuffle = world.compassshuffle.copy()
-    ret.keyshuffle = world.keyshuffle.copy()
-    ret.bigkeyshuffle = world.bigkeyshuffle.copy()
-    ret.crystals_needed_for_ganon = world.crystals_needed_for_ganon.copy()
-    ret.crystals_needed_for_gt = world.crystals_needed_for_gt.copy()
-    ret.crystals_ganon_orig = world.crystals_ganon_orig.copy()
-    ret.crystals_gt_orig = world.crystals_gt_orig.copy()
-    ret.open_pyramid = world.open_pyramid.copy()
-    ret.boss_shuffle = world.boss_shuffle.copy()
-    ret.enemy_shuffle = world.enemy_shuffle.copy()
-    ret.enemy_health = world.enemy_health.copy()
-    ret.enemy_damage = world.enemy_damage.copy()
-    ret.beemizer = world.beemizer.copy()
-    ret.intensity = world.intensity.copy()
-    ret.experimental = world.experimental.copy()
-    ret.keydropshuffle = world.keydropshuffle.copy()
-    ret.mixed_travel = world.mixed_travel.copy()
-    ret.standardize_palettes = world.standardize_palettes.copy()
-
-    for player in range(1, world.players + 1):
-        if world.mode[player] != 'inverted':
-            create_regions(ret, player)
-        else:
-            create_inverted_regions(ret, player)
-        create_dungeon_regions(ret, player)
-        create_shops(ret, player)
-        create_rooms(ret, player)
-        create_dungeons(ret, player)
-
-    copy_dynamic_regions_and_locations(world, ret)
-    for player in range(1, world.players + 1):
-        if world.mode[player] == 'standard':
-            parent = ret.get_region('Menu', player)
-            target = ret.get_region('Hyrule Castle Secret Entrance', player)
-            connection = Entrance(player, 'Uncle S&Q', parent)
-            parent.exits.append(connection)
-            connection.connect(target)
-
-    # copy bosses
-    for dungeon in world.dungeons:
-        for level, boss in dungeon.bosses.items():
-            ret.get_dungeon(dungeon.name, dungeon.player).bosses[level] = boss
-
-    for shop in world.shops:
-        copied_shop = ret.get_region(shop.region.name, shop.region.player).shop
-        copied_shop.inventory = copy.copy(shop.inventory)
-
-    # connect copied world
-    for region in world.regions:
-        copied_region = ret.get_region(region.name, region.player)
-        copied_region.is_light_world = region.is_light_world
-        copied_region.is_dark_world = region.is_dark_world
-        copied_region.dungeon = region.dungeon
-        copied_region.locations = [Location(location.player, location.name, parent=copied_region) for location in region.locations]
-        for entrance in region.entrances:
-            ret.get_entrance(entrance.name, entrance.player).connect(copied_region)
-
-    # fill locations
-    for location in world.get_locations():
-        new_location = ret.get_location(location.name, location.player)
-        if location.item is not None:
-            item = Item(location.item.name, location.item.advancement, location.item.priority, location.item.type, player = location.item.player)
-            new_location.item = item
-            item.location = new_location
-            item.world = ret
-        if location.event:
-            new_location.event = True
-        if location.locked:
-            new_location.locked = True
-        # these need to be modified properly by set_rules
-        new_location.access_rule = lambda state: True
-        new_location.item_rule = lambda state: True
-
-    # copy remaining itempool. No item in itempool should have an assigned location
-    for item in world.itempool:
-        ret.itempool.append(Item(item.name, item.advancement, item.priority, item.type, player = item.player))
-
-    for item in world.precollected_items:
-        ret.push_precollected(ItemFactory(item.name, item.player))
-
-    # copy progress items in state
-    ret.state.prog_items = world.state.prog_items.copy()
-    ret.state.stale = {player: True for player in range(1, world.players + 1)}
-
-    ret.doors = world.doors
-    for door in ret.doors:
-        entrance = ret.check_for_entrance(door.name, door.player)
-        if entrance is not None:
-            entrance.door = door
-    ret.paired_doors = world.paired_doors
-    ret.rooms = world.rooms
-    ret.inaccessible_regions = world.inaccessible_regions
-    ret.dungeon_layouts = world.dungeon_layouts
-    ret.key_logic = world.key_logic
-    ret.dungeon_portals = world.dungeon_portals
-    for player, portals in world.dungeon_portals.items():
-        for portal in portals:
-            connect_portal_copy(portal, ret, player)
-    ret.sanc_portal = world.sanc_portal
-
-    for player in range(1, world.players + 1):
-        set_rules(ret, player)
-
-    return ret
-
-def copy_dynamic_regions_and_locations(world, ret):
-    for region in world.dynamic_regions:
-        new_reg = Region(region.name, region.type, region.hint_text, region.player)
-        ret.regions.append(new_reg)
-        ret.initialize_regions([new_reg])
-        ret.dynamic_regions.append(new_reg)
-
-        # Note: ideally exits should be copied here, but the current use case (Take anys) do not require this
-
-        if region.shop:
-            new_reg.shop = Shop(new_reg, region.shop.room_id, region.shop.type, region.shop.shopkeeper_config, region.shop.custom, region.shop.locked)
-            ret.shops.append(new_reg.shop)
-
-    for location in world.dynamic_locations:
-        new_reg = ret.get_region(location.parent_region.name, location.parent_region.player)
-        new_loc = Location(location.player, location.name, location.address, location.crystal, location.hint_text, new_reg)
-        # todo: this is potentially dangerous. later refactor so we
-        # can apply dynamic region rules on top of copied world like other rules
-        new_loc.access_rule = location.access_rule
-        new_loc.always_allow = location.always_allow
-        new_loc.item_rule = location.item_rule
-        new_reg.locations.append(new_loc)
-
-        ret.clear_location_cache()
+def write_jsonout(jsonout, spoiler, outfile):
+    # same output as print(json.dumps({**jsonout, 'spoiler': spoiler.to_json()})), written as it is encoded
+    # the spoiler is embedded as a json string, escaping is per character so each chunk is escaped on its own
+    encoder = json.JSONEncoder()
+    outfile.write('{')
+    for key, value in jsonout.items():
+        outfile.write(encoder.encode(key) + ': ')
+        for chunk in encoder.iterencode(value):
+            outfile.write(chunk)
+        outfile.write(', ')
+    outfile.write('"spoiler": "')
+    for chunk in spoiler.iter_json():
+        outfile.write(encoder.encode(chunk)[1:-1])
+    outfile.write('"}\n')
 
 
 def create_playthrough(world):
-    # create a copy as we will modify it
-    old_world = world
-    world = copy_world(world)
-
+    # spheres are culled on the world itself, the graph and rules are shared and only the placement state
+    # that culling touches is saved up front and put back afterwards
+    placements = save_placements(world)
+    try:
+        calculate_playthrough(world)
+    finally:
+        restore_placements(world, placements)
+
+
+def save_placements(world):
+    locations = [(location, location.item, location.event, location.locked) for location in world.get_locations()]
+    inventories = [(shop, copy.copy(shop.inventory)) for shop in world.shops]
+    state = world.state.copy()
+    state.stale = world.state.stale.copy()
+    return locations, inventories, list(world.precollected_items), state
+
+
+def restore_placements(world, placements):
+    locations, inventories, precollected_items, state = placements
+    for location, item, event, locked in locations:
+        location.item = item
+        location.event = event
+        location.locked = locked
+    for shop, inventory in inventories:
+        shop.inventory = inventory
+    world.precollected_items = precollected_items
+    world.state = state
+
+
+def calculate_playthrough(world):
     # get locations containing progress items
     prog_locations = [location for location in world.get_filled_locations() if location.item.advancement]
     state_cache = [None]
@@ -546,7 +430,7 @@ def create_playthrough(world):
             if any([world.accessibility[location.item.player] != 'none' for location in sphere_candidates]):
                 raise RuntimeError(world.fish.translate("cli", "cli", "cannot.reach.progression"))
             else:
-                old_world.spoiler.unreachables = sphere_candidates.copy()
+                world.spoiler.unreachables = sphere_candidates.copy()
                 break
 
     # in the second phase, we cull each sphere such that the game is still beatable, reducing each range of influence to the bare minimum required inside it
@@ -600,7 +484,7 @@ def create_playthrough(world):
             raise RuntimeError(world.fish.translate("cli","cli","cannot.reach.required"))
 
     # store the required locations for statistical analysis
-    old_world.required_locations = [(location.name, location.player) for sphere in collection_spheres for location in sphere]
+    world.required_locations = [(location.name, location.player) for sphere in collection_spheres for location in sphere]
 
     def flist_to_iter(node):
         while node:
@@ -615,17 +499,17 @@ def create_playthrough(world):
         pathpairs = zip_longest(pathsiter, pathsiter)
         return list(pathpairs)
 
-    old_world.spoiler.paths = dict()
+    world.spoiler.paths = dict()
     for player in range(1, world.players + 1):
-        old_world.spoiler.paths.update({location.gen_name(): get_path(state, location.parent_region) for sphere in collection_spheres for location in sphere if location.player == player})
-        for _, path in dict(old_world.spoiler.paths).items():
+        world.spoiler.paths.update({location.gen_name(): get_path(state, location.parent_region) for sphere in collection_spheres for location in sphere if location.player == player})
+        for _, path in dict(world.spoiler.paths).items():
             if any(exit == 'Pyramid Fairy' for (_, exit) in path):
                 if world.mode[player] != 'inverted':
-                    old_world.spoiler.paths[str(world.get_region('Big Bomb Shop', player))] = get_path(state, world.get_region('Big Bomb Shop', player))
+                    world.spoiler.paths[str(world.get_region('Big Bomb Shop', player))] = get_path(state, world.get_region('Big Bomb Shop', player))
                 else:
-                    old_world.spoiler.paths[str(world.get_region('Inverted Big Bomb Shop', player))] = get_path(state, world.get_region('Inverted Big Bomb Shop', player))
+                    world.spoiler.paths[str(world.get_region('Inverted Big Bomb Shop', player))] = get_path(state, world.get_region('Inverted Big Bomb Shop', player))
 
     # we can finally output our playthrough
-    old_world.spoiler.playthrough = OrderedDict([("0", [str(item) for item in world.precollected_items if item.advancement])])
+    world.spoiler.playthrough = OrderedDict([("0", [str(item) for item in world.precollected_items if item.advancement])])
     for i, sphere in enumerate(collection_spheres):
-        old_world.spoiler.playthrough[str(i + 1)] = {location.gen_name(): str(location.item) for location in sphere}
+        world.spoiler.playthrough[str(i + 1)] = {location.gen_name(): str(location.item) for location in sphere}
@@ -1,9 +1,13 @@
 import argparse
+import hashlib
+import json
 import logging
+import multiprocessing
+import os
 import random
+import time
 import urllib.request
 import urllib.parse
-import re
 
 from DungeonRandomizer import parse_cli
 from Main import main as DRMain
@@ -16,7 +20,7 @@ def parse_yaml(txt):
     ret = {}
     indents = {len(txt) - len(txt.lstrip(' ')): ret}
     for line in txt.splitlines():
-        line = re.sub(r'#.*', '', line)
+        line = line.split('#', 1)[0]
         if not line:
             continue
         name, val = line.split(':', 1)
@@ -31,6 +35,87 @@ def parse_yaml(txt):
             indents[spaces+2] = newdict
     return ret
 
+# options that roll_settings maps through a fixed table, anything else would only fail while rolling
+mapped_options = {
+    'goals': ['ganon', 'fast_ganon', 'dungeons', 'pedestal', 'triforce-hunt'],
+    'weapons': ['randomized', 'assured', 'vanilla', 'swordless'],
+    'boss_shuffle': ['none', 'simple', 'full', 'random'],
+    'enemy_shuffle': ['none', 'shuffled', 'random'],
+    'enemy_damage': ['default', 'shuffled', 'random'],
+}
+
+# sections that hold options of their own, fixed or weighted, rather than the weights of one option
+nested_sections = ['rom', 'startinventory']
+
+class Weights(object):
+    # parsed weights with the cumulative weights of every choice worked out once, so rolling is just a lookup
+    def __init__(self, options, name='weights'):
+        self.order = list(options)
+        self.values = {}
+        self.choices = {}
+        self.sections = {}
+        for option, value in options.items():
+            if type(value) is not dict:
+                self.values[option] = value
+            elif not value:
+                self.values[option] = None
+            elif option in nested_sections or any(type(v) is dict for v in value.values()):
+                self.sections[option] = Weights(value, f'{name}.{option}')
+            else:
+                self.choices[option] = self.cumulative(value, f'{name}.{option}')
+
+    @staticmethod
+    def cumulative(choices, name):
+        population, cum_weights, total = [], [], 0
+        for choice, weight in choices.items():
+            try:
+                weight = int(weight)
+            except ValueError:
+                raise ValueError(f'{name}: weight of {choice} is not a number ({weight})')
+            if weight < 0:
+                raise ValueError(f'{name}: weight of {choice} is negative ({weight})')
+            total += weight
+            population.append(choice)
+            cum_weights.append(total)
+        if total == 0:
+            raise ValueError(f'{name}: no choice has any weight')
+        return population, cum_weights
+
+    def validate(self):
+        for option, known in mapped_options.items():
+            if option in self.choices:
+                population, cum_weights = self.choices[option]
+                previous = 0
+                outcomes = []
+                for choice, total in zip(population, cum_weights):
+                    if total > previous:
+                        outcomes.append(choice)
+                    previous = total
+            else:
+                outcomes = [self.values.get(option)]
+            for outcome in outcomes:
+                if outcome not in known:
+                    raise ValueError(f'{option}: {outcome} is not one of {", ".join(known)}')
+        return self
+
+    def __contains__(self, option):
+        return option in self.values or option in self.choices or option in self.sections
+
+    def __getitem__(self, option):
+        return self.values[option]
+
+    def choice(self, option):
+        if option in self.choices:
+            population, cum_weights = self.choices[option]
+            return random.choices(population, cum_weights=cum_weights)[0]
+        return self.values.get(option)
+
+    def section(self, option):
+        return self.sections.get(option) or Weights({})
+
+    def options(self):
+        return self.order
+
 def main():
     parser = argparse.ArgumentParser(add_help=False)
     parser.add_argument('--multi', default=1, type=lambda value: min(max(int(value), 1), 255))
@@ -47,6 +132,10 @@ def main():
     parser.add_argument('--rom')
     parser.add_argument('--enemizercli')
     parser.add_argument('--outputpath')
+    parser.add_argument('--count', help='Roll and generate this many seeds from the same weights', default=1, type=lambda value: max(int(value), 1))
+    parser.add_argument('--processes', help='Worker processes used to generate a batch, defaults to the cpu count', type=int)
+    parser.add_argument('--manifest', help='Where the rolled settings and timings of a batch are recorded', default='mystery_manifest.json')
+    parser.add_argument('--refresh_weights', help='Fetch weights urls again instead of using the copy cached on disk', action='store_true')
     for player in range(1, multiargs.multi + 1):
         parser.add_argument(f'--p{player}', help=argparse.SUPPRESS)
     args = parser.parse_args()
@@ -56,22 +145,80 @@ def main():
         seed = random.randint(0, 999999999)
     else:
         seed = args.seed
-    random.seed(seed)
-
-    seedname = f'M{random.randint(0, 999999999)}'
-    print(f"Generating mystery for {args.multi} player{'s' if args.multi > 1 else ''}, {seedname} Seed {seed}")
 
     weights_cache = {}
     if args.weights:
-        weights_cache[args.weights] = get_weights(args.weights)
+        weights_cache[args.weights] = get_weights(args.weights, args.refresh_weights)
         print(f"Weights: {args.weights} >> {weights_cache[args.weights]['description']}")
     for player in range(1, args.multi + 1):
         path = getattr(args, f'p{player}')
         if path:
             if path not in weights_cache:
-                weights_cache[path] = get_weights(path)
+                weights_cache[path] = get_weights(path, args.refresh_weights)
             print(f"P{player} Weights: {path} >> {weights_cache[path]['description']}")
 
+    if args.count == 1:
+        seedname, erargs, _ = roll_mystery(args, weights_cache, seed)
+
+        # set up logger
+        loglevel = {'error': logging.ERROR, 'info': logging.INFO, 'warning': logging.WARNING, 'debug': logging.DEBUG}[erargs.loglevel]
+        logging.basicConfig(format='%(message)s', level=loglevel)
+
+        DRMain(erargs, seed, BabelFish())
+    else:
+        roll_batch(args, weights_cache, seed)
+
+
+def roll_batch(args, weights_cache, seed):
+    # every seed of the batch comes from the first one, so a batch can be rolled again
+    seed_rng = random.Random(seed)
+    seeds = [seed] + [seed_rng.randint(0, 999999999) for _ in range(args.count - 1)]
+
+    manifest = []
+    tasks = []
+    start = time.perf_counter()
+    for seed in seeds:
+        seedname, erargs, rolled = roll_mystery(args, weights_cache, seed)
+        manifest.append({'seed': seed, 'seedname': seedname, 'settings': rolled})
+        tasks.append((seed, erargs))
+
+    processes = min(len(tasks), args.processes if args.processes else os.cpu_count() or 1)
+    if processes > 1:
+        with multiprocessing.Pool(processes) as pool:
+            results = pool.map(generate_mystery, tasks)
+    else:
+        results = [generate_mystery(task) for task in tasks]
+
+    for entry, (seconds, error) in zip(manifest, results):
+        entry['time'] = seconds
+        entry['error'] = error
+    failures = [entry for entry in manifest if entry['error'] is not None]
+    print(f"Generated {len(seeds) - len(failures)} of {len(seeds)} mystery seeds in {time.perf_counter() - start:.2f}s")
+
+    manifest_path = os.path.join(args.outputpath, args.manifest) if args.outputpath else args.manifest
+    with open(manifest_path, 'w') as f:
+        json.dump({'weights': list(weights_cache.keys()), 'players': args.multi, 'seeds': manifest}, f, indent=2)
+
+
+def generate_mystery(task):
+    seed, erargs = task
+    loglevel = {'error': logging.ERROR, 'info': logging.INFO, 'warning': logging.WARNING, 'debug': logging.DEBUG}[erargs.loglevel]
+    logging.basicConfig(format='%(message)s', level=loglevel)
+    start = time.perf_counter()
+    try:
+        DRMain(erargs, seed, BabelFish())
+    except Exception as e:
+        logging.getLogger('').warning('Mystery seed %s failed: %s', seed, e)
+        return time.perf_counter() - start, str(e)
+    return time.perf_counter() - start, None
+
+
+def roll_mystery(args, weights_cache, seed):
+    random.seed(seed)
+
+    seedname = f'M{random.randint(0, 999999999)}'
+    print(f"Generating mystery for {args.multi} player{'s' if args.multi > 1 else ''}, {seedname} Seed {seed}")
+
     erargs = parse_cli(['--multi', str(args.multi)])
     erargs.seed = seed
     erargs.names = args.names
@@ -87,26 +234,33 @@ def main():
 
     settings_cache = {k: (roll_settings(v) if args.samesettings else None) for k, v in weights_cache.items()}
 
+    rolled = {}
     for player in range(1, args.multi + 1):
         path = getattr(args, f'p{player}') if getattr(args, f'p{player}') else args.weights
         if path:
             settings = settings_cache[path] if settings_cache[path] else roll_settings(weights_cache[path])
+            rolled[player] = {k: v for k, v in vars(settings).items() if v is not None}
             for k, v in vars(settings).items():
                 if v is not None:
                     getattr(erargs, k)[player] = v
         else:
             raise RuntimeError(f'No weights specified for player {player}')
 
-    # set up logger
-    loglevel = {'error': logging.ERROR, 'info': logging.INFO, 'warning': logging.WARNING, 'debug': logging.DEBUG}[erargs.loglevel]
-    logging.basicConfig(format='%(message)s', level=loglevel)
-
-    DRMain(erargs, seed, BabelFish())
+    return seedname, erargs, rolled
 
-def get_weights(path):
+def get_weights(path, refresh=False):
     try:
         if urllib.parse.urlparse(path).scheme:
-            yaml = str(urllib.request.urlopen(path).read(), "utf-8")
+            # urls are only fetched once, batches and later runs read the copy on disk
+            cache_path = os.path.join(".", "resources", "user", "weights", hashlib.sha1(path.encode('utf-8')).hexdigest() + '.yaml')
+            if refresh or not os.path.isfile(cache_path):
+                yaml = str(urllib.request.urlopen(path).read(), "utf-8")
+                os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+                with open(cache_path, 'w', encoding='utf-8') as f:
+                    f.write(yaml)
+            else:
+                with open(cache_path, 'r', encoding='utf-8') as f:
+                    yaml = f.read()
         else:
             with open(path, 'rb') as f:
                 yaml = str(f.read(), "utf-8")
@@ -114,17 +268,11 @@ def get_weights(path):
         print('Failed to read weights (%s)' % e)
         return
 
-    return parse_yaml(yaml)
+    return Weights(parse_yaml(yaml), path).validate()
 
 def roll_settings(weights):
     def get_choice(option, root=weights):
-        if option not in root:
-            return None
-        if type(root[option]) is not dict:
-            return root[option]
-        if not root[option]:
-            return None
-        return random.choices(list(root[option].keys()), weights=list(map(int,root[option].values())))[0]
+        return root.choice(option)
 
     ret = argparse.Namespace()
 
@@ -208,15 +356,15 @@ def roll_settings(weights):
 
     ret.beemizer = int(get_choice('beemizer')) if 'beemizer' in weights else 0
 
-    inventoryweights = weights.get('startinventory', {})
+    inventoryweights = weights.section('startinventory')
     startitems = []
-    for item in inventoryweights.keys():
+    for item in inventoryweights.options():
         if get_choice(item, inventoryweights) == 'on':
             startitems.append(item)
     ret.startinventory = ','.join(startitems)
 
     if 'rom' in weights:
-        romweights = weights['rom']
+        romweights = weights.section('rom')
         ret.sprite = get_choice('sprite', romweights)
         ret.disablemusic = get_choice('disablemusic', romweights) == 'on'
         ret.quickswap = get_choice('quickswap', romweights) == 'on'
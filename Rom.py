@@ -340,16 +340,50 @@ def patch_enemizer(world, player, rom, baserom_path, enemizercli, random_sprite_
         pass
 
 _sprite_table = {}
+_sprite_index_path = local_path(os.path.join("data", "sprites", "sprite_index.json"))
 def _populate_sprite_table():
     if not _sprite_table:
+        # names come from a persisted index so only the sprite that gets used has to be read in full
+        try:
+            with open(_sprite_index_path, 'r') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = {}
+        changed = False
         for dir in [local_path(os.path.join("data","sprites","official")), local_path(os.path.join("data","sprites","unofficial"))]:
-            for file in os.listdir(dir):
-                filepath = os.path.join(dir, file)
-                if not os.path.isfile(filepath):
-                    continue
-                sprite = Sprite(filepath)
-                if sprite.valid:
-                    _sprite_table[sprite.name.lower()] = filepath
+            dir_mtime = os.stat(dir).st_mtime if os.path.isdir(dir) else None
+            dir_index = index.get(dir)
+            if dir_index is None or dir_index['mtime'] != dir_mtime:
+                dir_index = refresh_sprite_index(dir, dir_mtime, dir_index)
+                index[dir] = dir_index
+                changed = True
+            for entry in dir_index['sprites']:
+                _sprite_table[entry['name'].lower()] = entry['path']
+        if changed:
+            try:
+                with open(_sprite_index_path, 'w') as f:
+                    json.dump(index, f, indent=1)
+            except OSError:
+                pass
+
+
+def refresh_sprite_index(dir, dir_mtime, dir_index):
+    known = {entry['path']: entry for entry in dir_index['sprites']} if dir_index else {}
+    sprites = []
+    for file in os.listdir(dir) if dir_mtime is not None else []:
+        filepath = os.path.join(dir, file)
+        if not os.path.isfile(filepath):
+            continue
+        stat = os.stat(filepath)
+        entry = known.get(filepath)
+        if entry is None or entry['mtime'] != stat.st_mtime or entry['size'] != stat.st_size:
+            metadata = Sprite.read_metadata(filepath)
+            if metadata is None:
+                continue
+            name, author, checksum = metadata
+            entry = {'name': name, 'author': author, 'path': filepath, 'mtime': stat.st_mtime, 'size': stat.st_size, 'checksum': checksum}
+        sprites.append(entry)
+    return {'mtime': dir_mtime, 'sprites': sprites}
 
 def get_sprite_from_name(name):
     _populate_sprite_table()
@@ -426,6 +460,38 @@ class Sprite(object):
     def default_link_sprite():
         return get_sprite_from_name('Link')
 
+    @staticmethod
+    def read_metadata(filename):
+        # same validity checks as the constructor, but only the zspr header and names are read
+        size = os.path.getsize(filename)
+        if size in [0x7000, 0x7078, 0x707C, 0x100000, 0x200000]:
+            return (os.path.basename(filename), None, None)
+        headerstr = "<4xBHHIHIHH6x"
+        headersize = struct.calcsize(headerstr)
+        with open(filename, 'rb') as stream:
+            header = stream.read(headersize)
+            if not header.startswith(b'ZSPR') or len(header) < headersize:
+                return None
+            (version, csum, icsum, sprite_offset, sprite_size, palette_offset, palette_size, kind) = struct.unpack(headerstr, header)
+            if version not in [1] or kind != 1 or sprite_size != 0x7000 or palette_size not in [0, 0x78, 0x7C]:
+                return None
+            if sprite_offset + sprite_size > size or palette_offset + palette_size > size:
+                return None
+            sprite_name = Sprite.read_utf16le(stream)
+            author_name = Sprite.read_utf16le(stream)
+        return (sprite_name, author_name, csum)
+
+    @staticmethod
+    def read_utf16le(stream):
+        "Decodes a null-terminated UTF-16_LE string of unknown size from a stream"
+        raw = bytearray()
+        while True:
+            char = stream.read(2)
+            if char in [b'', b'\x00\x00']:
+                break
+            raw += char
+        return raw.decode('utf-16_le')
+
     def decode8(self, pos):
         arr = [[0 for _ in range(8)] for _ in range(8)]
         for y in range(8):
@@ -473,18 +539,8 @@ class Sprite(object):
         stream = io.BytesIO(filedata)
         stream.seek(headersize)
 
-        def read_utf16le(stream):
-            "Decodes a null-terminated UTF-16_LE string of unknown size from a stream"
-            raw = bytearray()
-            while True:
-                char = stream.read(2)
-                if char in [b'', b'\x00\x00']:
-                    break
-                raw += char
-            return raw.decode('utf-16_le')
-
-        sprite_name = read_utf16le(stream)
-        author_name = read_utf16le(stream)
+        sprite_name = self.read_utf16le(stream)
+        author_name = self.read_utf16le(stream)
 
         # Ignoring the Author Rom name for the time being.
 
@@ -9,7 +9,6 @@ def set_rules(world, player):
 
     if world.logic[player] == 'nologic':
         logging.getLogger('').info('WARNING! Seeds generated under this logic often require major glitches and may be impossible!')
-        world.get_region('Menu', player).can_reach_private = lambda state: True
         for exit in world.get_region('Menu', player).exits:
             exit.hide_path = True
         return
@@ -107,7 +106,6 @@ def global_rules(world, player):
     add_item_rule(world.get_location('Ganon', player), lambda item: item.name == 'Triforce' and item.player == player)
 
     # we can s&q to the old man house after we rescue him. This may be somewhere completely different if caves are shuffled!
-    world.get_region('Menu', player).can_reach_private = lambda state: True
     for exit in world.get_region('Menu', player).exits:
         exit.hide_path = True
 
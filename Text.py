@@ -1,5 +1,6 @@
 # -*- coding: UTF-8 -*-
 from collections import OrderedDict
+from functools import lru_cache
 import logging
 
 text_addresses = {'Pedestal': (0x180300, 256),
@@ -648,7 +649,9 @@ class CompressedTextMapper(object):
         0x7A: 0xFC,
     }
 
+    # hint and junk texts repeat across players and teams, results are immutable so they can be shared
     @classmethod
+    @lru_cache(maxsize=4096)
     def convert(cls, text, pause=True, max_bytes_expanded=0x800, wrap=14):
         inbuf = MultiByteCoreTextMapper.convert(text, pause, wrap)
 
@@ -680,7 +683,7 @@ class CompressedTextMapper(object):
                     outbuf.append(inbuf.pop())
             else:
                 raise ValueError("Unexpected byte found in uncompressed string")
-        return outbuf
+        return bytes(outbuf)
 
 class CharTextMapper(object):
     number_offset = None
@@ -1234,9 +1237,15 @@ class LargeCreditBottomMapper(CharTextMapper):
 
 class TextTable(object):
     SIZE = 0x7355
+    _default_text = None
+
     def __init__(self):
-        self._text = OrderedDict()
-        self.setDefaultText()
+        if TextTable._default_text is None:
+            # converting the default text is a fixed cost, only pay it once per process
+            self._text = OrderedDict()
+            self.setDefaultText()
+            TextTable._default_text = OrderedDict((key, bytes(value)) for key, value in self._text.items())
+        self._text = OrderedDict(TextTable._default_text)
 
     def __getitem__(self, key):
         return self._text[key]
@@ -1262,7 +1271,7 @@ class TextTable(object):
         return data
 
     def removeUnwantedText(self):
-        nomessage = bytes(CompressedTextMapper.convert("{NOTEXT}", False))
+        nomessage = CompressedTextMapper.convert("{NOTEXT}", False)
         messages_to_zero = [
             #escort Messages
             'zelda_go_to_throne',
@@ -0,0 +1,34 @@
+# times the key logic analysis of a generated crossed world
+# usage: python -m resources.ci.benchmarks.key_logic [seed]
+import contextlib
+import io
+import sys
+import time
+
+from source.classes.BabelFish import BabelFish
+from CLI import parse_cli
+from KeyDoorShuffle import KeyLogic, analyze_dungeon
+from Main import main
+
+
+def key_logic_benchmark(world, player=1, repeat=5):
+    layouts = list(world.key_layout[player].values())
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for key_layout in layouts:
+            key_layout.key_logic = KeyLogic(key_layout.sector.name)
+            analyze_dungeon(key_layout, world, player)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None or elapsed < best else best
+    counters = sum(len(key_layout.key_counters) for key_layout in layouts)
+    print('%d layouts, %d key counters: %.3fs best of %d' % (len(layouts), counters, best, repeat))
+
+
+if __name__ == '__main__':
+    seed = sys.argv[1] if len(sys.argv) > 1 else '12'
+    args = parse_cli(['--jsonout', '--door_shuffle', 'crossed', '--seed', seed])
+    # the json patch goes to stdout, only the timings are of interest
+    with contextlib.redirect_stdout(io.StringIO()):
+        world = main(args, seed=args.seed, fish=BabelFish())
+    key_logic_benchmark(world)
@@ -0,0 +1,26 @@
+# times the hint and junk text conversions of a 20 player, 3 team patch run with and without memoization
+# usage: python -m resources.ci.benchmarks.text_convert
+import time
+
+from Text import CompressedTextMapper, junk_texts, Triforce_texts, Sahasrahla2_texts, Uncle_texts, Blind_texts, Ganon1_texts, TavernMan_texts
+
+
+def convert_benchmark(players=20, teams=3):
+    texts = junk_texts + Triforce_texts + Sahasrahla2_texts + Uncle_texts + Blind_texts + Ganon1_texts + TavernMan_texts
+    uncached = CompressedTextMapper.convert.__wrapped__
+    start = time.perf_counter()
+    for _ in range(players * teams):
+        for text in texts:
+            uncached(CompressedTextMapper, text)
+    plain = time.perf_counter() - start
+    CompressedTextMapper.convert.cache_clear()
+    start = time.perf_counter()
+    for _ in range(players * teams):
+        for text in texts:
+            CompressedTextMapper.convert(text)
+    memoized = time.perf_counter() - start
+    print('%d conversions: %.3fs plain, %.3fs memoized (%s)' % (players * teams * len(texts), plain, memoized, CompressedTextMapper.convert.cache_info()))
+
+
+if __name__ == '__main__':
+    convert_benchmark()
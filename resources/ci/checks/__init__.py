@@ -0,0 +1 @@
+# do nothing, just exist to make "resources.ci.checks" package
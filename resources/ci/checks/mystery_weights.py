@@ -0,0 +1,70 @@
+# rolls weights files with fixed and weighted options in the nested rom and startinventory sections
+# usage: python -m resources.ci.checks.mystery_weights
+import random
+
+from Mystery import Weights, parse_yaml, roll_settings
+
+base_weights = '''description: check
+glitches_required:
+  none: 1
+dungeon_items:
+  standard: 1
+  full: 1
+accessibility: items
+entrance_shuffle: none
+door_shuffle:
+  basic: 1
+  crossed: 1
+goals: ganon
+tower_open: 7
+ganon_open: 7
+world_state:
+  open: 1
+  standard: 1
+hints: on
+weapons: randomized
+item_pool: normal
+item_functionality: normal
+boss_shuffle: none
+enemy_shuffle: none
+enemy_damage: default
+enemy_health: default
+pot_shuffle: off
+'''
+
+fixed_sections = '''startinventory:
+  Pegasus Boots: on
+  Hookshot: off
+rom:
+  sprite: link
+  quickswap: on
+  menuspeed: normal
+'''
+
+weighted_sections = '''startinventory:
+  Pegasus Boots:
+    on: 1
+    off: 0
+rom:
+  sprite:
+    link: 1
+  quickswap:
+    on: 1
+    off: 0
+  menuspeed: normal
+'''
+
+
+def check(sections):
+    settings = roll_settings(Weights(parse_yaml(base_weights + sections), 'check').validate())
+    assert settings.sprite == 'link', settings.sprite
+    assert settings.quickswap, settings.quickswap
+    assert settings.fastmenu == 'normal', settings.fastmenu
+    assert settings.startinventory == 'Pegasus Boots', settings.startinventory
+
+
+if __name__ == '__main__':
+    random.seed(0)
+    check(fixed_sections)
+    check(weighted_sections)
+    print('Mystery weights rolled as expected')
@@ -11,6 +11,7 @@ class BabelFish():
 			self.langs.append(self.locale)
 
 		self.lang_defns = {} #collect translations
+		self.lang_files = {} #translation files not loaded yet, read on first use of their domain
 		self.add_translation_file() #start with default translation file
 		self.add_translation_file(["resources","app","cli"]) #add help translation file
 		self.add_translation_file(["resources","app","gui"]) #add gui label translation file
@@ -32,12 +33,19 @@ class BabelFish():
 				self.lang_defns[lang] = {}
 			langs_filename = os.path.join(subpath,lang + ".json") #get filename of translation file
 			if os.path.isfile(langs_filename): #if we've got a file
-				with open(langs_filename,encoding="utf-8") as f: #open it
-					self.lang_defns[lang][key[:key.rfind(os.sep)].replace(os.sep,'.')] = json.load(f) #save translation definitions
+				domain = key[:key.rfind(os.sep)].replace(os.sep,'.')
+				self.lang_defns[lang].pop(domain, None) #later files replace earlier ones
+				self.lang_files[(lang, domain)] = langs_filename
 			else:
 				pass
 #				print(langs_filename + " not found for translation!")
 
+	def load_domain(self, lang, domain):
+		langs_filename = self.lang_files.pop((lang, domain), None)
+		if langs_filename is not None:
+			with open(langs_filename,encoding="utf-8") as f: #open it
+				self.lang_defns[lang][domain] = json.load(f) #save translation definitions
+
 	def translate(self, domain="", key="", subkey="", uselang=None): #three levels of keys
     # start with nothing
 		display_text = ""
@@ -94,6 +102,8 @@ class BabelFish():
 				subkey = " - ".join(tmp)
 			subkey = subkey.strip()
 
+		for lang in [uselang if uselang is not None else self.locale, "en"]:
+			self.load_domain(lang, domain)
 		my_lang = self.lang_defns[uselang if uselang is not None else self.locale ] #handle for localization
 		en_lang = self.lang_defns["en"] #handle for English
 